@@ -4,15 +4,227 @@
 """
 
 import os
+import re
+import copy
+import glob
 import json
-from typing import Any, Dict, Optional
-from ..utils.constants import CONFIG_FILE
+import hashlib
+import marshal
+import threading
+from dataclasses import fields
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
+from ..utils.constants import CONFIG_FILE, SAVE_DEBOUNCE_SECONDS, MAX_CONFIG_BACKUPS
 from .config_models import (
     AppConfig, PromptConfig, HotkeyConfig,
     GeminiProviderConfig, GPTProviderConfig, UIConfig,
     ConfigValidator
 )
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:  # pragma: no cover
+    _HAS_ORJSON = False
+
+try:
+    import fastjsonschema
+except ImportError:  # pragma: no cover - 未安装时保存前不做结构校验
+    fastjsonschema = None
+
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+_PROVIDER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "api_key": {"type": "string"},
+        "model": {"type": "string"},
+        "base_url": {"type": "string"},
+        "use_proxy": {"type": "boolean"},
+        "available_models": _STRING_LIST,
+    },
+}
+
+# 写盘前校验的配置结构（只校验类型，不限制额外字段）；加载时由配置模型归一化类型，保证 to_dict() 符合此结构
+_CONFIG_SCHEMA = {
+    "type": "object",
+    "required": ["config_version", "provider", "gemini", "gpt", "ui", "prompts", "hotkeys"],
+    "properties": {
+        "config_version": {"type": "string"},
+        "provider": {"type": "string"},
+        "gemini": _PROVIDER_SCHEMA,
+        "gpt": _PROVIDER_SCHEMA,
+        "proxy": {"type": "string"},
+        "ui": {
+            "type": "object",
+            "properties": {
+                "window_width": {"type": "number"},
+                "window_height": {"type": "number"},
+                "window_min_width": {"type": "number"},
+                "window_min_height": {"type": "number"},
+                "background_opacity": {"type": "number", "minimum": 0, "maximum": 255},
+                "enable_capture_protection": {"type": "boolean"},
+            },
+        },
+        "max_screenshot_history": {"type": "number", "minimum": 0},
+        "prompts": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name", "hotkey", "content"],
+                "properties": {
+                    "name": {"type": "string"},
+                    "hotkey": {"type": "string"},
+                    "content": {"type": "string"},
+                },
+            },
+        },
+        "hotkeys": {"type": "object", "additionalProperties": {"type": "string"}},
+    },
+}
+
+# 校验函数在导入时生成一次
+_validate_config = fastjsonschema.compile(_CONFIG_SCHEMA) if fastjsonschema else None
+
+
+# 扁平化键（旧版接口）到新配置结构的映射：key -> (section, attr)
+_KEY_MAPPING: Dict[str, Tuple[str, Optional[str]]] = {
+    "api_key": ("gemini", "api_key"),
+    "proxy": ("proxy", None),
+    "provider": ("provider", None),
+    "gemini_model": ("gemini", "model"),
+    "gemini_base_url": ("gemini", "base_url"),
+    "gemini_use_proxy": ("gemini", "use_proxy"),
+    "available_gemini_models": ("gemini", "available_models"),
+    "gpt_api_key": ("gpt", "api_key"),
+    "gpt_model": ("gpt", "model"),
+    "gpt_base_url": ("gpt", "base_url"),
+    "gpt_use_proxy": ("gpt", "use_proxy"),
+    "available_gpt_models": ("gpt", "available_models"),
+    "background_opacity": ("ui", "background_opacity"),
+    "window_width": ("ui", "window_width"),
+    "window_height": ("ui", "window_height"),
+    "max_screenshot_history": ("max_screenshot_history", None),
+    "prompts": ("prompts", None),
+    "hotkeys": ("hotkeys", None),
+    "enable_capture_protection": ("ui", "enable_capture_protection"),
+}
+
+
+# AppConfig 的顶级分区（与 AppConfig.to_dict 的键一致）
+_SECTIONS = frozenset(f.name for f in fields(AppConfig))
+_MISSING = object()
+
+# 解析结果缓存（<config>.cache）的格式版本，结构变化时递增使旧缓存失效
+_LOAD_CACHE_FORMAT = 1
+
+# 旧版配置特有的扁平化键 / 新版配置中作为嵌套对象的分区
+_LEGACY_MARKER_KEYS = ("api_key", "gemini_model", "gpt_api_key", "window_width")
+_V2_NESTED_KEYS = ("gemini", "gpt", "ui")
+
+# 新版配置把 config_version 写在最前面，只需扫描文件开头读取主版本号即可判断是否需要迁移检查
+_VERSION_TAG_RE = re.compile(rb'"config_version"\s*:\s*"(\d+)\.')
+_VERSION_SCAN_BYTES = 4096
+
+
+# 旧版扁平键到新版嵌套路径的映射：(目标路径, 按优先级排列的旧版键)
+_V1_TO_V2_MAP: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...] = (
+    (("provider",), ("provider",)),
+    (("gemini", "api_key"), ("api_key",)),
+    (("gemini", "model"), ("gemini_model", "model")),
+    (("gemini", "base_url"), ("gemini_base_url",)),
+    (("gemini", "use_proxy"), ("gemini_use_proxy",)),
+    (("gemini", "available_models"), ("available_gemini_models",)),
+    (("gpt", "api_key"), ("gpt_api_key",)),
+    (("gpt", "model"), ("gpt_model",)),
+    (("gpt", "base_url"), ("gpt_base_url",)),
+    (("gpt", "use_proxy"), ("gpt_use_proxy",)),
+    (("gpt", "available_models"), ("available_gpt_models",)),
+    (("proxy",), ("proxy",)),
+    (("ui", "window_width"), ("window_width",)),
+    (("ui", "window_height"), ("window_height",)),
+    (("ui", "window_min_width"), ("window_min_width",)),
+    (("ui", "window_min_height"), ("window_min_height",)),
+    (("ui", "background_opacity"), ("background_opacity",)),
+    (("max_screenshot_history",), ("max_screenshot_history",)),
+    (("prompts",), ("prompts",)),
+    (("hotkeys",), ("hotkeys",)),
+)
+
+
+def _set_path(data: Dict[str, Any], path: Tuple[str, ...], value: Any) -> None:
+    """按路径写入嵌套字典，缺少的中间层自动创建"""
+    *parents, last = path
+    for part in parents:
+        data = data.setdefault(part, {})
+    data[last] = value
+
+
+@lru_cache(maxsize=256)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """拆分点分隔的配置键（结果缓存，避免每次查询重复 split）"""
+    return tuple(key.split("."))
+
+
+def _copy_mutable(value: Any) -> Any:
+    """列表、字典返回深拷贝，其他值原样返回"""
+    return copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+
+
+def _sniff_major_version(raw: bytes) -> int:
+    """只在文件开头查找 config_version 的主版本号，找不到时视为旧版（1）"""
+    match = _VERSION_TAG_RE.search(raw, 0, _VERSION_SCAN_BYTES)
+    return int(match.group(1)) if match else 1
+
+
+def _loads_config(raw: bytes) -> Any:
+    """解析 UTF-8 JSON 配置（orjson.JSONDecodeError 是 json.JSONDecodeError 的子类）"""
+    if _HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_config_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _read_config_file(path: str) -> Any:
+    """以二进制读取并解析配置文件"""
+    return _loads_config(_read_config_bytes(path))
+
+
+def _dumps_config(data: Dict[str, Any]) -> bytes:
+    """序列化配置为 UTF-8 JSON（优先使用 orjson，未安装时回退到标准库）"""
+    if _HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _file_sha1(path: str) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _write_atomic(path: str, payload: bytes) -> None:
+    """先写临时文件并 fsync，再原子替换目标文件，避免写入过程中文件缺失或半写"""
+    tmp_file = f"{path}.tmp"
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
 
 class ConfigManager:
     """配置管理器 - 简化版"""
@@ -20,19 +232,86 @@ class ConfigManager:
     def __init__(self):
         self.config_file = CONFIG_FILE
         self._app_config: Optional[AppConfig] = None
+        # 扁平/嵌套字典缓存，配置变更时失效
+        self._flat_cache: Optional[Dict[str, Any]] = None
+        # 嵌套键按顶级分区懒加载：section -> 该分区的字典，首次访问时才生成
+        self._nested_cache: Dict[str, Any] = {}
+        # 延迟保存：短时间内的多次修改合并为一次写盘
+        # _pending 是在修改配置的线程中生成的快照，定时器线程只写快照，不遍历正在被修改的配置对象
+        self._pending: Optional[Dict[str, Any]] = None
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()   # 保护 _pending / _save_timer
+        self._write_lock = threading.Lock()  # 串行化写文件（定时器线程与主线程可能同时保存）
+        self._last_save_ok = True
+        self._last_save_error = ""
+        self._backup_done = False
         self._load_config()
 
+    def _invalidate_cache(self) -> None:
+        """配置对象变更后清除字典缓存"""
+        self._flat_cache = None
+        self._nested_cache.clear()
+
+    def _schedule_save(self, delay: float = SAVE_DEBOUNCE_SECONDS) -> None:
+        """记录当前配置的快照，并在 delay 秒后统一写盘"""
+        snapshot = self._app_config.to_dict()
+        with self._save_lock:
+            self._pending = snapshot
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self) -> bool:
+        """
+        立即写入尚未保存的修改（退出前、用户保存设置后调用）
+
+        写盘失败时快照保留，下次保存时重试；返回 False 表示仍有修改未写入文件。
+        """
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            data = self._pending
+        if data is None:
+            return True
+
+        ok = self._write_config(data)
+        with self._save_lock:
+            if ok and self._pending is data:
+                self._pending = None
+            self._last_save_ok = ok
+        return ok
+
+    @property
+    def last_save_ok(self) -> bool:
+        """最近一次写盘是否成功"""
+        return self._last_save_ok
+
+    @property
+    def last_save_error(self) -> str:
+        """最近一次写盘失败的原因（成功时为空字符串）"""
+        return self._last_save_error
+
     def _load_config(self):
         """加载配置文件"""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                # 检查是否需要迁移旧配置
-                if self._is_legacy_config(data):
-                    data = self._migrate_legacy_config(data)
-                    self._save_to_file(data)
+                # 文件自上次加载后未修改时直接使用缓存的解析结果
+                data = self._read_load_cache()
+                if data is None:
+                    raw = _read_config_bytes(self.config_file)
+                    data = _loads_config(raw)
+
+                    # 检查是否需要迁移旧配置（开头已标明新版本号时跳过）
+                    if (_sniff_major_version(raw) < 2
+                            and self._is_legacy_config(data)):
+                        # 迁移结果经配置对象归一化后再写盘，保证通过结构校验
+                        data = AppConfig.from_dict(self._migrate_legacy_config(data)).to_dict()
+                        self._save_to_file(data)
+                    else:
+                        self._write_load_cache(data)
 
                 self._app_config = AppConfig.from_dict(data)
             else:
@@ -46,6 +325,28 @@ class ConfigManager:
             # 其他错误
             self._handle_config_error(f"配置加载失败: {e}")
 
+    def _read_load_cache(self) -> Optional[Dict[str, Any]]:
+        """配置文件的 mtime 和大小与缓存记录一致时返回缓存的解析结果，否则返回 None"""
+        try:
+            stat = os.stat(self.config_file)
+            with open(f"{self.config_file}.cache", 'rb') as f:
+                fmt, mtime_ns, size, data = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if (fmt != _LOAD_CACHE_FORMAT or not isinstance(data, dict)
+                or mtime_ns != stat.st_mtime_ns or size != stat.st_size):
+            return None
+        return data
+
+    def _write_load_cache(self, data: Dict[str, Any]) -> None:
+        """记录当前配置文件的 mtime、大小和解析结果（配置只含基本类型，可用 marshal 序列化）"""
+        try:
+            stat = os.stat(self.config_file)
+            with open(f"{self.config_file}.cache", 'wb') as f:
+                marshal.dump((_LOAD_CACHE_FORMAT, stat.st_mtime_ns, stat.st_size, data), f)
+        except (OSError, ValueError):
+            pass
+
     def _handle_config_error(self, error_msg: str):
         """处理配置错误"""
         print(f"⚠️ {error_msg}")
@@ -76,8 +377,7 @@ class ConfigManager:
             print("请编辑 model_config.json 填入您的 API Key")
 
             # 加载复制的配置
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_config_file(self.config_file)
             self._app_config = AppConfig.from_dict(data)
         else:
             # 示例文件也不存在，使用默认配置
@@ -87,13 +387,8 @@ class ConfigManager:
 
     def _is_legacy_config(self, data: Dict[str, Any]) -> bool:
         """检查是否是旧版配置格式"""
-        # 旧版配置有这些扁平化的键
-        legacy_keys = ["api_key", "gemini_model", "gpt_api_key", "window_width"]
-        # 新版配置有 gemini/gpt 作为嵌套对象
-        new_keys = ["gemini", "gpt", "ui"]
-
-        has_legacy = any(key in data for key in legacy_keys)
-        has_new = all(key in data and isinstance(data[key], dict) for key in new_keys)
+        has_legacy = any(key in data for key in _LEGACY_MARKER_KEYS)
+        has_new = all(isinstance(data.get(key), dict) for key in _V2_NESTED_KEYS)
 
         return has_legacy and not has_new
 
@@ -104,35 +399,13 @@ class ConfigManager:
         # 创建备份
         self._backup_config(old)
 
-        new_config = {
-            "config_version": "2.1.0",
-            "provider": old.get("provider", "Gemini"),
-            "gemini": {
-                "api_key": old.get("api_key", ""),
-                "model": old.get("gemini_model", old.get("model", "gemini-2.5-flash")),
-                "base_url": old.get("gemini_base_url", "https://generativelanguage.googleapis.com"),
-                "use_proxy": old.get("gemini_use_proxy", False),
-                "available_models": old.get("available_gemini_models", ["gemini-2.5-flash", "gemini-2.5-pro"])
-            },
-            "gpt": {
-                "api_key": old.get("gpt_api_key", ""),
-                "model": old.get("gpt_model", "gpt-4o"),
-                "base_url": old.get("gpt_base_url", "https://api.openai.com/v1"),
-                "use_proxy": old.get("gpt_use_proxy", False),
-                "available_models": old.get("available_gpt_models", ["gpt-4o", "gpt-4o-mini"])
-            },
-            "proxy": old.get("proxy", ""),
-            "ui": {
-                "window_width": old.get("window_width", 550),
-                "window_height": old.get("window_height", 800),
-                "window_min_width": old.get("window_min_width", 500),
-                "window_min_height": old.get("window_min_height", 700),
-                "background_opacity": old.get("background_opacity", 120)
-            },
-            "max_screenshot_history": old.get("max_screenshot_history", 10),
-            "prompts": old.get("prompts", []),
-            "hotkeys": old.get("hotkeys", {})
-        }
+        # 以新版默认配置为基础，按映射表逐项覆盖旧版中存在的字段
+        new_config = AppConfig().to_dict()
+        for path, sources in _V1_TO_V2_MAP:
+            for source in sources:
+                if source in old:
+                    _set_path(new_config, path, old[source])
+                    break
 
         print("配置迁移完成！")
         return new_config
@@ -142,28 +415,58 @@ class ConfigManager:
         backup_dir = os.path.join(os.path.dirname(self.config_file), "config_backups")
         os.makedirs(backup_dir, exist_ok=True)
 
+        payload = _dumps_config(config)
+        # 文件名带时间戳，按名称排序即按时间排序
+        backups = sorted(glob.glob(os.path.join(backup_dir, "config_backup_*.json")))
+        if backups and _file_sha1(backups[-1]) == hashlib.sha1(payload).hexdigest():
+            print(f"旧配置与最近的备份相同，跳过备份: {backups[-1]}")
+            return
+
         from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_file = os.path.join(backup_dir, f"config_backup_{timestamp}.json")
 
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        # 备份落盘后才会覆盖原配置，迁移中途崩溃也不会丢失旧配置
+        _write_atomic(backup_file, payload)
         print(f"旧配置已备份到: {backup_file}")
 
+        # 只保留最近的 MAX_CONFIG_BACKUPS 份备份
+        if backup_file not in backups:
+            backups.append(backup_file)
+        for old_backup in backups[:-MAX_CONFIG_BACKUPS]:
+            try:
+                os.remove(old_backup)
+            except OSError:
+                pass
+
     def _save_to_file(self, data: Dict[str, Any]) -> bool:
         """保存字典数据到文件"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            if _validate_config is not None:
+                # 结构不合法时放弃写入，避免错误的数据覆盖配置文件
+                _validate_config(data)
+            _write_atomic(self.config_file, _dumps_config(data))
+            self._write_load_cache(data)
+            self._last_save_error = ""
             return True
         except Exception as e:
-            print(f"保存配置失败: {e}")
+            if fastjsonschema is not None and isinstance(e, fastjsonschema.JsonSchemaException):
+                self._last_save_error = f"配置结构校验失败: {e.message}"
+            else:
+                self._last_save_error = f"写入配置文件失败: {e}"
+            print(f"保存配置失败: {self._last_save_error}")
             return False
 
     @property
     def config(self) -> Dict[str, Any]:
-        """获取配置字典（向后兼容）"""
-        return self._to_flat_dict()
+        """获取配置字典的副本（向后兼容），修改副本不会影响配置，写入请使用 set()"""
+        return copy.deepcopy(self._flat())
+
+    def _flat(self) -> Dict[str, Any]:
+        """扁平化配置的内部缓存，不能交给调用方修改"""
+        if self._flat_cache is None:
+            self._flat_cache = self._to_flat_dict()
+        return self._flat_cache
 
     def _to_flat_dict(self) -> Dict[str, Any]:
         """转换为扁平化字典（向后兼容旧代码）"""
@@ -205,87 +508,163 @@ class ConfigManager:
         }
 
     def save_config(self) -> bool:
-        """保存配置到文件"""
-        try:
-            # 创建备份
-            if os.path.exists(self.config_file):
-                backup_file = f"{self.config_file}.backup"
-                try:
-                    import shutil
-                    shutil.copy2(self.config_file, backup_file)
-                except Exception:
-                    pass
-
-            # 保存新配置
-            data = self._app_config.to_dict()
-            return self._save_to_file(data)
-
-        except Exception as e:
-            print(f"保存配置失败: {e}")
-            return False
+        """立即保存当前配置到文件"""
+        snapshot = self._app_config.to_dict()
+        with self._save_lock:
+            self._pending = snapshot
+        return self.flush()
+
+    def _write_config(self, data: Dict[str, Any]) -> bool:
+        """写入配置快照"""
+        with self._write_lock:
+            try:
+                # 每次运行只在首次保存前备份一次
+                if not self._backup_done and os.path.exists(self.config_file):
+                    backup_file = f"{self.config_file}.backup"
+                    try:
+                        import shutil
+                        shutil.copy2(self.config_file, backup_file)
+                        self._backup_done = True
+                    except Exception:
+                        pass
+
+                return self._save_to_file(data)
+
+            except Exception as e:
+                print(f"保存配置失败: {e}")
+                return False
 
     def get(self, key: str, default: Any = None) -> Any:
-        """获取配置值（向后兼容）"""
-        flat = self._to_flat_dict()
-        return flat.get(key, default)
+        """
+        获取配置值（向后兼容），支持 "gemini.api_key" 形式的嵌套键
+
+        列表、字典等可变值返回副本，调用方修改返回值不会影响缓存和配置对象。
+        """
+        flat = self._flat()
+        if key in flat:
+            return _copy_mutable(flat[key])
+        if "." not in key:
+            return default
+
+        section, *rest = _split_key(key)
+        node = self._nested_section(section)
+        if node is _MISSING:
+            return default
+        for part in rest:
+            if not isinstance(node, dict) or part not in node:
+                return default
+            node = node[part]
+        return _copy_mutable(node)
+
+    def _nested_section(self, section: str) -> Any:
+        """返回顶级分区的字典形式，只转换被访问到的分区"""
+        node = self._nested_cache.get(section, _MISSING)
+        if node is _MISSING and section in _SECTIONS:
+            value = getattr(self._app_config, section)
+            if hasattr(value, "to_dict"):
+                node = value.to_dict()
+            elif section == "prompts":
+                node = [p.to_dict() for p in value]
+            else:
+                node = value
+            self._nested_cache[section] = node
+        return node
 
     def set(self, key: str, value: Any) -> bool:
-        """设置配置值（向后兼容）"""
-        cfg = self._app_config
+        """
+        设置配置值（向后兼容）
 
-        # 映射扁平化键到新结构
-        key_mapping = {
-            "api_key": ("gemini", "api_key"),
-            "proxy": ("proxy", None),
-            "provider": ("provider", None),
-            "gemini_model": ("gemini", "model"),
-            "gemini_base_url": ("gemini", "base_url"),
-            "gemini_use_proxy": ("gemini", "use_proxy"),
-            "available_gemini_models": ("gemini", "available_models"),
-            "gpt_api_key": ("gpt", "api_key"),
-            "gpt_model": ("gpt", "model"),
-            "gpt_base_url": ("gpt", "base_url"),
-            "gpt_use_proxy": ("gpt", "use_proxy"),
-            "available_gpt_models": ("gpt", "available_models"),
-            "background_opacity": ("ui", "background_opacity"),
-            "window_width": ("ui", "window_width"),
-            "window_height": ("ui", "window_height"),
-            "max_screenshot_history": ("max_screenshot_history", None),
-            "prompts": ("prompts", None),
-            "hotkeys": ("hotkeys", None),
-            "enable_capture_protection": ("ui", "enable_capture_protection"),
-        }
+        修改会延迟写盘；返回 False 表示最近一次写盘失败（修改仍保留在内存中，下次保存时重试）。
+        """
+        cfg = self._app_config
 
-        if key in key_mapping:
-            section, attr = key_mapping[key]
-
-            if attr is None:
-                # 顶级属性
-                if key == "prompts":
-                    cfg.prompts = [
-                        PromptConfig.from_dict(p) if isinstance(p, dict) else p
-                        for p in value
-                    ]
-                elif key == "hotkeys":
-                    cfg.hotkeys = HotkeyConfig.from_dict(value) if isinstance(value, dict) else value
-                else:
-                    setattr(cfg, section, value)
+        if key not in _KEY_MAPPING:
+            # 未映射的键不会写入配置对象，无需保存
+            return self._last_save_ok
+
+        section, attr = _KEY_MAPPING[key]
+        if self._current_value(key, section, attr) == value:
+            return self._last_save_ok
+
+        if attr is None:
+            # 顶级属性
+            if key == "prompts":
+                cfg.prompts = [
+                    PromptConfig.from_dict(p) if isinstance(p, dict) else p
+                    for p in value
+                ]
+            elif key == "hotkeys":
+                cfg.hotkeys = HotkeyConfig.from_dict(value) if isinstance(value, dict) else value
             else:
-                # 嵌套属性
-                nested_obj = getattr(cfg, section)
-                setattr(nested_obj, attr, value)
+                setattr(cfg, section, value)
+        else:
+            # 嵌套属性
+            nested_obj = getattr(cfg, section)
+            setattr(nested_obj, attr, _copy_mutable(value))
 
-        return self.save_config()
+        self._invalidate_cache()
+        self._schedule_save()
+        return self._last_save_ok
+
+    def _current_value(self, key: str, section: str, attr: Optional[str]) -> Any:
+        """从配置对象读取当前值（不经过缓存，避免调用方修改缓存列表后误判为未变化）"""
+        cfg = self._app_config
+        if key == "prompts":
+            return [p.to_dict() for p in cfg.prompts]
+        if key == "hotkeys":
+            return cfg.hotkeys.to_dict()
+        if attr is None:
+            return getattr(cfg, section)
+        return getattr(getattr(cfg, section), attr, None)
 
     def update(self, updates: Dict[str, Any]) -> bool:
-        """批量更新配置"""
+        """批量更新配置，返回值含义同 set"""
+        ok = True
         for key, value in updates.items():
-            self.set(key, value)
-        return self.save_config()
+            ok = self.set(key, value) and ok
+        return ok
+
+    # ─── 提示词增量修改：只改动内存中的单个条目，写盘仍由 _schedule_save 合并 ───
+
+    @staticmethod
+    def _as_prompt(prompt: Union[PromptConfig, Dict[str, str]]) -> PromptConfig:
+        return PromptConfig.from_dict(prompt) if isinstance(prompt, dict) else prompt
+
+    def append_prompt(self, prompt: Union[PromptConfig, Dict[str, str]]) -> int:
+        """追加提示词，返回新提示词的索引"""
+        prompts = self._app_config.prompts
+        prompts.append(self._as_prompt(prompt))
+        self._invalidate_cache()
+        self._schedule_save()
+        return len(prompts) - 1
+
+    def patch_prompt(self, index: int, prompt: Union[PromptConfig, Dict[str, str]]) -> bool:
+        """替换指定索引的提示词，索引无效时返回 False"""
+        prompts = self._app_config.prompts
+        if not 0 <= index < len(prompts):
+            return False
+        new_prompt = self._as_prompt(prompt)
+        if prompts[index] == new_prompt:
+            return True
+        prompts[index] = new_prompt
+        self._invalidate_cache()
+        self._schedule_save()
+        return True
+
+    def remove_prompt(self, index: int) -> bool:
+        """删除指定索引的提示词，索引无效时返回 False"""
+        prompts = self._app_config.prompts
+        if not 0 <= index < len(prompts):
+            return False
+        del prompts[index]
+        self._invalidate_cache()
+        self._schedule_save()
+        return True
 
     def reset_to_default(self) -> bool:
         """重置为默认配置"""
         self._app_config = AppConfig.get_default()
+        self._invalidate_cache()
         return self.save_config()
 
     def get_app_config(self) -> AppConfig:
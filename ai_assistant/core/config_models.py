@@ -6,11 +6,70 @@
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 import os
-
-
-@dataclass
+from ..utils.constants import (
+    DEFAULT_HOTKEYS, DEFAULT_PROVIDER,
+    DEFAULT_GEMINI_MODEL, DEFAULT_GEMINI_BASE_URL, DEFAULT_GEMINI_MODELS,
+    DEFAULT_GPT_MODEL, DEFAULT_GPT_BASE_URL, DEFAULT_GPT_MODELS,
+)
+
+
+# 默认提示词模板 (name, hotkey, content)，导入时构建一次
+_DEFAULT_PROMPTS = (
+    (
+        "代码实现助手",
+        "alt+1",
+        "你是一个专业的代码实现助手。请分析这张截图中的内容，并提供相应的代码实现。\n要求：\n1. 提供可运行的代码，解释通过代码注释提供\n2. 代码实现逻辑尽量简洁高效",
+    ),
+    (
+        "详细分析专家",
+        "alt+2",
+        "你是一个技术分析专家。请仔细分析这张截图中的内容，提供：\n1. 详细的技术分析\n2. 可能的实现方案\n3. 最佳实践建议",
+    ),
+    (
+        "问题回答助手",
+        "alt+3",
+        "你是一个问题回答助手，识别截图中的问题和代码信息，帮助补全未完成的代码",
+    ),
+)
+
+
+# 加载时的类型归一化：旧文件或手工编辑可能留下 null / 错误类型，统一转换后 to_dict() 才能通过写盘校验
+def _as_str(value: Any, default: str = "") -> str:
+    if value is None:
+        return default
+    return value if isinstance(value, str) else str(value)
+
+
+def _as_bool(value: Any, default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def _as_int(value: Any, default: int) -> int:
+    if isinstance(value, bool):
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _as_str_list(value: Any, default: List[str]) -> List[str]:
+    if not isinstance(value, list):
+        return list(default)
+    return [item for item in value if isinstance(item, str)]
+
+
+def _as_dict(value: Any) -> Dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+@dataclass(slots=True)
 class PromptConfig:
-    """提示词配置"""
+    """提示词配置（slots：提示词界面直接持有实例并按属性访问）"""
     name: str
     hotkey: str
     content: str
@@ -21,20 +80,20 @@ class PromptConfig:
     @classmethod
     def from_dict(cls, data: Dict[str, str]) -> "PromptConfig":
         return cls(
-            name=data.get("name", ""),
-            hotkey=data.get("hotkey", ""),
-            content=data.get("content", "")
+            name=_as_str(data.get("name")),
+            hotkey=_as_str(data.get("hotkey")),
+            content=_as_str(data.get("content"))
         )
 
 
 @dataclass
 class HotkeyConfig:
     """热键配置"""
-    toggle: str = "alt+q"
-    screenshot_only: str = "alt+w"
-    clear_screenshots: str = "alt+v"
-    scroll_up: str = "alt+up"
-    scroll_down: str = "alt+down"
+    toggle: str = DEFAULT_HOTKEYS["toggle"]
+    screenshot_only: str = DEFAULT_HOTKEYS["screenshot_only"]
+    clear_screenshots: str = DEFAULT_HOTKEYS["clear_screenshots"]
+    scroll_up: str = DEFAULT_HOTKEYS["scroll_up"]
+    scroll_down: str = DEFAULT_HOTKEYS["scroll_down"]
 
     def to_dict(self) -> Dict[str, str]:
         return {
@@ -48,11 +107,11 @@ class HotkeyConfig:
     @classmethod
     def from_dict(cls, data: Dict[str, str]) -> "HotkeyConfig":
         return cls(
-            toggle=data.get("toggle", "alt+q"),
-            screenshot_only=data.get("screenshot_only", "alt+w"),
-            clear_screenshots=data.get("clear_screenshots", "alt+v"),
-            scroll_up=data.get("scroll_up", "alt+up"),
-            scroll_down=data.get("scroll_down", "alt+down")
+            toggle=_as_str(data.get("toggle"), DEFAULT_HOTKEYS["toggle"]),
+            screenshot_only=_as_str(data.get("screenshot_only"), DEFAULT_HOTKEYS["screenshot_only"]),
+            clear_screenshots=_as_str(data.get("clear_screenshots"), DEFAULT_HOTKEYS["clear_screenshots"]),
+            scroll_up=_as_str(data.get("scroll_up"), DEFAULT_HOTKEYS["scroll_up"]),
+            scroll_down=_as_str(data.get("scroll_down"), DEFAULT_HOTKEYS["scroll_down"])
         )
 
 
@@ -60,13 +119,10 @@ class HotkeyConfig:
 class GeminiProviderConfig:
     """Gemini 服务商配置"""
     api_key: str = ""
-    model: str = "gemini-2.5-flash"
-    base_url: str = "https://generativelanguage.googleapis.com"
+    model: str = DEFAULT_GEMINI_MODEL
+    base_url: str = DEFAULT_GEMINI_BASE_URL
     use_proxy: bool = False
-    available_models: List[str] = field(default_factory=lambda: [
-        "gemini-2.5-flash",
-        "gemini-2.5-pro"
-    ])
+    available_models: List[str] = field(default_factory=lambda: list(DEFAULT_GEMINI_MODELS))
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -80,11 +136,11 @@ class GeminiProviderConfig:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "GeminiProviderConfig":
         return cls(
-            api_key=data.get("api_key", os.getenv("GEMINI_KEY", "")),
-            model=data.get("model", "gemini-2.5-flash"),
-            base_url=data.get("base_url", "https://generativelanguage.googleapis.com"),
-            use_proxy=data.get("use_proxy", False),
-            available_models=data.get("available_models", ["gemini-2.5-flash", "gemini-2.5-pro"])
+            api_key=_as_str(data.get("api_key"), os.getenv("GEMINI_KEY", "")),
+            model=_as_str(data.get("model"), DEFAULT_GEMINI_MODEL),
+            base_url=_as_str(data.get("base_url"), DEFAULT_GEMINI_BASE_URL),
+            use_proxy=_as_bool(data.get("use_proxy"), False),
+            available_models=_as_str_list(data.get("available_models"), DEFAULT_GEMINI_MODELS)
         )
 
 
@@ -92,13 +148,10 @@ class GeminiProviderConfig:
 class GPTProviderConfig:
     """GPT 服务商配置"""
     api_key: str = ""
-    model: str = "gpt-4o"
-    base_url: str = "https://api.openai.com/v1"
+    model: str = DEFAULT_GPT_MODEL
+    base_url: str = DEFAULT_GPT_BASE_URL
     use_proxy: bool = False
-    available_models: List[str] = field(default_factory=lambda: [
-        "gpt-4o",
-        "gpt-4o-mini"
-    ])
+    available_models: List[str] = field(default_factory=lambda: list(DEFAULT_GPT_MODELS))
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -112,11 +165,11 @@ class GPTProviderConfig:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "GPTProviderConfig":
         return cls(
-            api_key=data.get("api_key", ""),
-            model=data.get("model", "gpt-4o"),
-            base_url=data.get("base_url", "https://api.openai.com/v1"),
-            use_proxy=data.get("use_proxy", False),
-            available_models=data.get("available_models", ["gpt-4o", "gpt-4o-mini"])
+            api_key=_as_str(data.get("api_key")),
+            model=_as_str(data.get("model"), DEFAULT_GPT_MODEL),
+            base_url=_as_str(data.get("base_url"), DEFAULT_GPT_BASE_URL),
+            use_proxy=_as_bool(data.get("use_proxy"), False),
+            available_models=_as_str_list(data.get("available_models"), DEFAULT_GPT_MODELS)
         )
 
 
@@ -149,12 +202,12 @@ class UIConfig:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "UIConfig":
         return cls(
-            window_width=data.get("window_width", 550),
-            window_height=data.get("window_height", 800),
-            window_min_width=data.get("window_min_width", 500),
-            window_min_height=data.get("window_min_height", 700),
-            background_opacity=data.get("background_opacity", 120),
-            enable_capture_protection=data.get("enable_capture_protection", True),
+            window_width=_as_int(data.get("window_width"), 550),
+            window_height=_as_int(data.get("window_height"), 800),
+            window_min_width=_as_int(data.get("window_min_width"), 500),
+            window_min_height=_as_int(data.get("window_min_height"), 700),
+            background_opacity=_as_int(data.get("background_opacity"), 120),
+            enable_capture_protection=_as_bool(data.get("enable_capture_protection"), True),
         )
 
 
@@ -165,7 +218,7 @@ class AppConfig:
     config_version: str = "2.1.0"
 
     # AI 服务商
-    provider: str = "Gemini"
+    provider: str = DEFAULT_PROVIDER
     gemini: GeminiProviderConfig = field(default_factory=GeminiProviderConfig)
     gpt: GPTProviderConfig = field(default_factory=GPTProviderConfig)
 
@@ -197,43 +250,29 @@ class AppConfig:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AppConfig":
         """从字典创建配置对象"""
-        prompts_data = data.get("prompts", [])
-        prompts = [PromptConfig.from_dict(p) if isinstance(p, dict) else p for p in prompts_data]
+        prompts_data = data.get("prompts")
+        prompts = [
+            PromptConfig.from_dict(p) if isinstance(p, dict) else p
+            for p in (prompts_data if isinstance(prompts_data, list) else [])
+            if isinstance(p, (dict, PromptConfig))
+        ]
 
         return cls(
-            config_version=data.get("config_version", "2.1.0"),
-            provider=data.get("provider", "Gemini"),
-            gemini=GeminiProviderConfig.from_dict(data.get("gemini", {})),
-            gpt=GPTProviderConfig.from_dict(data.get("gpt", {})),
-            proxy=data.get("proxy", os.getenv("CLASH_PROXY", "")),
-            ui=UIConfig.from_dict(data.get("ui", {})),
-            max_screenshot_history=data.get("max_screenshot_history", 10),
+            config_version=_as_str(data.get("config_version"), "2.1.0"),
+            provider=_as_str(data.get("provider"), DEFAULT_PROVIDER),
+            gemini=GeminiProviderConfig.from_dict(_as_dict(data.get("gemini"))),
+            gpt=GPTProviderConfig.from_dict(_as_dict(data.get("gpt"))),
+            proxy=_as_str(data.get("proxy")) if "proxy" in data else os.getenv("CLASH_PROXY", ""),
+            ui=UIConfig.from_dict(_as_dict(data.get("ui"))),
+            max_screenshot_history=max(0, _as_int(data.get("max_screenshot_history"), 10)),
             prompts=prompts,
-            hotkeys=HotkeyConfig.from_dict(data.get("hotkeys", {}))
+            hotkeys=HotkeyConfig.from_dict(_as_dict(data.get("hotkeys")))
         )
 
     @classmethod
     def get_default(cls) -> "AppConfig":
-        """获取默认配置"""
-        return cls(
-            prompts=[
-                PromptConfig(
-                    name="代码实现助手",
-                    hotkey="alt+1",
-                    content="你是一个专业的代码实现助手。请分析这张截图中的内容，并提供相应的代码实现。\n要求：\n1. 提供可运行的代码，解释通过代码注释提供\n2. 代码实现逻辑尽量简洁高效"
-                ),
-                PromptConfig(
-                    name="详细分析专家",
-                    hotkey="alt+2",
-                    content="你是一个技术分析专家。请仔细分析这张截图中的内容，提供：\n1. 详细的技术分析\n2. 可能的实现方案\n3. 最佳实践建议"
-                ),
-                PromptConfig(
-                    name="问题回答助手",
-                    hotkey="alt+3",
-                    content="你是一个问题回答助手，识别截图中的问题和代码信息，帮助补全未完成的代码"
-                )
-            ]
-        )
+        """获取默认配置（提示词从模块级模板生成新实例，调用方可以自由修改）"""
+        return cls(prompts=[PromptConfig(*values) for values in _DEFAULT_PROMPTS])
 
 
 class ConfigValidator:
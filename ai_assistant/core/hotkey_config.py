@@ -3,9 +3,39 @@
 集中管理系统保留快捷键，避免与用户自定义快捷键冲突
 """
 
+import re
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
 
+# 修饰键的标准顺序
+_MODIFIER_ORDER = ('ctrl', 'alt', 'shift', 'cmd', 'win')
+
+# 标准化后的快捷键语法：若干修饰键 + 一个主键
+_HOTKEY_RE = re.compile(
+    r"^(?:(?:ctrl|alt|shift|cmd|win)\+)*"
+    r"(?:[a-z0-9]|f[1-9]|f1[0-2]|space|enter|tab|esc|up|down|left|right)$"
+)
+
+
+@lru_cache(maxsize=256)
+def _normalize_hotkey(hotkey: str) -> str:
+    """标准化快捷键（结果缓存，同一字符串只解析一次）"""
+    parts = hotkey.lower().split('+')
+    modifiers = []
+    keys = []
+
+    for part in parts:
+        part = part.strip()
+        if part in _MODIFIER_ORDER:
+            modifiers.append(part)
+        else:
+            keys.append(part)
+
+    modifiers.sort(key=_MODIFIER_ORDER.index)
+    return '+'.join(modifiers + keys)
+
+
 class HotkeyConfig:
     """快捷键配置管理"""
 
@@ -97,24 +127,15 @@ class HotkeyConfig:
 
     @classmethod
     def normalize_hotkey(cls, hotkey: str) -> str:
-        """标准化快捷键格式"""
+        """标准化快捷键格式（修饰键按 ctrl/alt/shift/cmd/win 排序并转为小写）"""
         if not hotkey:
             return ""
+        return _normalize_hotkey(hotkey)
 
-        parts = hotkey.lower().split('+')
-        modifiers = []
-        keys = []
-        modifier_order = ['ctrl', 'alt', 'shift', 'cmd', 'win']
-
-        for part in parts:
-            part = part.strip()
-            if part in modifier_order:
-                modifiers.append(part)
-            else:
-                keys.append(part)
-
-        modifiers.sort(key=lambda x: modifier_order.index(x) if x in modifier_order else 99)
-        return '+'.join(modifiers + keys)
+    @classmethod
+    def is_valid_hotkey(cls, hotkey: str) -> bool:
+        """检查快捷键是否符合 "修饰键+主键" 的语法"""
+        return bool(hotkey) and _HOTKEY_RE.match(cls.normalize_hotkey(hotkey)) is not None
 
     @classmethod
     def get_reserved_hotkeys_display(cls) -> str:
@@ -4,23 +4,61 @@
 """
 
 import os
+import queue
+import sys
+import threading
 import time
+from collections import deque
 from datetime import datetime
 from PyQt6 import QtCore
 from ..utils.constants import (
-    MAX_LOG_ENTRIES, LOG_DIR_NAME, LOG_SUBDIR, LOG_RETENTION_DAYS
+    MAX_LOG_ENTRIES, LOG_DIR_NAME, LOG_SUBDIR, LOG_RETENTION_DAYS,
+    LOG_EMIT_INTERVAL_MS
 )
 
 
 class LogManager(QtCore.QObject):
-    log_updated = QtCore.pyqtSignal(str)
+    log_updated = QtCore.pyqtSignal(str)  # 可能包含多行（按批次合并）
+    _flush_requested = QtCore.pyqtSignal()
 
     def __init__(self):
         super().__init__()
-        self.logs = []
+        self.logs = deque(maxlen=MAX_LOG_ENTRIES)  # 超出上限时自动丢弃最旧的条目
         self.log_file = None
+        self.log_dir = None
+        self._log_queue = queue.Queue()  # 待写入文件的日志行，None 表示停止
+        self._writer_thread = None
+        # 仅在有界面订阅时发射信号；仅在交互式控制台下回显到终端
+        # 订阅数在 connectNotify/disconnectNotify 中计数（Qt 不允许在这两个回调里调用 receivers()）
+        # PyQt6 没有 QMetaMethod.fromSignal，按信号在元对象中的索引识别 log_updated
+        self._log_updated_index = self.metaObject().indexOfSignal("log_updated(QString)")
+        self._listener_count = 0
+        self._has_listener = False
+        self._echo = __debug__ and sys.stdout is not None and sys.stdout.isatty()
+        # 合并短时间内的多条日志，按固定间隔批量发射，避免界面频繁重排
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._emit_timer = QtCore.QTimer(self)
+        self._emit_timer.setInterval(LOG_EMIT_INTERVAL_MS)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.timeout.connect(self._flush_pending)
+        # add_log 可能在工作线程调用，通过信号在主线程启动定时器
+        self._flush_requested.connect(self._emit_timer.start)
         self.setup_log_file()
 
+    def connectNotify(self, signal: QtCore.QMetaMethod) -> None:
+        super().connectNotify(signal)
+        if signal.methodIndex() == self._log_updated_index:
+            self._listener_count += 1
+            self._has_listener = True
+
+    def disconnectNotify(self, signal: QtCore.QMetaMethod) -> None:
+        super().disconnectNotify(signal)
+        # 整体断开（disconnect() 不带参数）时 signal 无效，此时无法得知剩余订阅数，保守地认为仍有订阅
+        if signal.methodIndex() == self._log_updated_index and self._listener_count > 0:
+            self._listener_count -= 1
+            self._has_listener = self._listener_count > 0
+
     def setup_log_file(self) -> None:
         """设置日志文件，实现日志轮转"""
         try:
@@ -31,47 +69,89 @@ class LogManager(QtCore.QObject):
             log_filename = f"gemini_{datetime.now().strftime('%Y%m%d')}.log"
             log_path = os.path.join(log_dir, log_filename)
 
-            # 清理超过指定天数的旧日志
-            self.cleanup_old_logs(log_dir, days=LOG_RETENTION_DAYS)
-
+            # 旧日志清理不在启动时同步执行，由界面显示后延迟调用 cleanup_old_logs
+            self.log_dir = log_dir
             self.log_file = log_path
+
+            # 后台线程批量写入，避免每条日志都在调用线程上 open/close 文件
+            self._writer_thread = threading.Thread(
+                target=self._drain_log_queue, args=(log_path,),
+                name="LogWriter", daemon=True
+            )
+            self._writer_thread.start()
         except Exception as e:
             print(f"设置日志文件失败: {e}")
             self.log_file = None
 
-    def cleanup_old_logs(self, log_dir: str, days: int = LOG_RETENTION_DAYS) -> None:
-        """清理旧日志文件"""
+    def _drain_log_queue(self, log_path: str) -> None:
+        """日志写入线程：持有文件句柄，按批写入队列中的日志行"""
+        try:
+            with open(log_path, 'a', encoding='utf-8', buffering=8192) as f:
+                while True:
+                    line = self._log_queue.get()
+                    if line is None:
+                        break
+
+                    batch = [line]
+                    stop = False
+                    while True:
+                        try:
+                            line = self._log_queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if line is None:
+                            stop = True
+                            break
+                        batch.append(line)
+
+                    f.write("".join(batch))
+                    f.flush()
+                    if stop:
+                        break
+        except Exception as e:
+            print(f"日志写入线程异常退出: {e}")
+
+    def cleanup_old_logs(self, log_dir: str = None, days: int = LOG_RETENTION_DAYS) -> None:
+        """清理旧日志文件，未指定目录时使用当前日志目录"""
+        log_dir = log_dir or self.log_dir
+        if not log_dir:
+            return
         try:
-            current_time = time.time()
-            for filename in os.listdir(log_dir):
-                if filename.startswith("gemini_") and filename.endswith(".log"):
-                    file_path = os.path.join(log_dir, filename)
-                    if os.path.getmtime(file_path) < current_time - (days * 24 * 60 * 60):
-                        os.remove(file_path)
+            cutoff = time.time() - (days * 24 * 60 * 60)
+            with os.scandir(log_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith("gemini_") and name.endswith(".log"):
+                        if entry.stat().st_mtime < cutoff:
+                            os.remove(entry.path)
         except Exception:
             pass
 
     def add_log(self, message: str, level: str = "INFO") -> None:
         """添加日志条目"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {level}: {message}"
-
-        # 内存日志轮转
-        if len(self.logs) >= MAX_LOG_ENTRIES:
-            self.logs = self.logs[-MAX_LOG_ENTRIES + 100:]  # 保留最近的900条
+        now = datetime.now()
+        log_entry = f"[{now.strftime('%H:%M:%S')}] {level}: {message}"
 
         self.logs.append(log_entry)
-        self.log_updated.emit(log_entry)
-        print(log_entry)
-
-        # 同时写入文件
+        if self._has_listener:
+            with self._pending_lock:
+                self._pending.append(log_entry)
+                first = len(self._pending) == 1
+            if first:
+                self._flush_requested.emit()
+        if self._echo:
+            print(log_entry)
+
+        # 同时写入文件（交给后台线程）
         if self.log_file:
-            try:
-                with open(self.log_file, 'a', encoding='utf-8') as f:
-                    full_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    f.write(f"[{full_timestamp}] {level}: {message}\n")
-            except Exception:
-                pass
+            self._log_queue.put_nowait(f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] {level}: {message}\n")
+
+    def _flush_pending(self) -> None:
+        """把积压的日志合并为一次信号发射"""
+        with self._pending_lock:
+            lines, self._pending = self._pending, []
+        if lines:
+            self.log_updated.emit("\n".join(lines))
 
     def get_logs(self) -> str:
         """获取所有日志"""
@@ -83,4 +163,11 @@ class LogManager(QtCore.QObject):
 
     def get_log_count(self) -> int:
         """获取日志条数"""
-        return len(self.logs)
\ No newline at end of file
+        return len(self.logs)
+
+    def close(self) -> None:
+        """停止写入线程并把剩余日志刷到文件"""
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._log_queue.put_nowait(None)
+            self._writer_thread.join(timeout=2)
+        self._writer_thread = None
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Markdown 渲染缓存
+相同的 markdown 源码（重复出现的块、示例内容）直接返回缓存的 HTML，不再重新解析
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class MarkdownCache:
+    """按源码缓存渲染结果的 LRU，条目超过 ttl 秒后失效"""
+
+    def __init__(self, maxsize: int = 50, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # 源码 -> (写入时间, HTML)；str 的哈希值由解释器缓存，查找无需再次遍历源码
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, source: str) -> Optional[str]:
+        """命中时返回 HTML 并标记为最近使用，未命中或已过期返回 None"""
+        entry = self._entries.get(source)
+        if entry is None:
+            return None
+        stamp, html = entry
+        if time.monotonic() - stamp > self.ttl:
+            del self._entries[source]
+            return None
+        self._entries.move_to_end(source)
+        return html
+
+    def put(self, source: str, html: str) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        self._entries[source] = (time.monotonic(), html)
+        self._entries.move_to_end(source)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def render(self, md, source: str) -> str:
+        """使用 md 渲染 source，优先返回缓存结果"""
+        html = self.get(source)
+        if html is None:
+            html = md.render(source)
+            self.put(source, html)
+        return html
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -172,7 +172,7 @@ class LogViewerWidget(QtWidgets.QWidget):
 
     @QtCore.pyqtSlot(str)
     def append_log(self, message: str):
-        """追加日志消息"""
+        """追加日志消息（一批可能包含多行）"""
         if self._log_filter_text:
             # 如果有过滤条件，重新渲染
             self._render_logs()
@@ -5,9 +5,147 @@
 """
 
 import ctypes
+import logging
+import re
+import sys
+import time
+from typing import Optional
 from PyQt6 import QtCore, QtGui, QtWidgets
 from ..utils.constants import OVERLAY_WIDTH, OVERLAY_HEIGHT
 from .theme import DesignTokens
+from ._md_cache import MarkdownCache
+
+logger = logging.getLogger(__name__)
+
+# 防截屏 API 在导入时解析一次并声明参数类型，非 Windows 平台为 None
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _SetWindowDisplayAffinity = _user32.SetWindowDisplayAffinity
+    _SetWindowDisplayAffinity.argtypes = [wintypes.HWND, wintypes.DWORD]
+    _SetWindowDisplayAffinity.restype = wintypes.BOOL
+else:
+    _SetWindowDisplayAffinity = None
+
+try:
+    from markdown_it import MarkdownIt
+    _HAS_MD = True
+except ImportError:  # pragma: no cover - 缺少 markdown-it-py 时以纯文本显示
+    MarkdownIt = None
+    _HAS_MD = False
+
+# 围栏代码块的起止行（``` 或 ~~~，最多缩进 3 个空格）
+_FENCE_RE = re.compile(r' {0,3}(`{3,}|~{3,})')
+
+# 列表项起始行（- / + / * 或 1. / 1)），松散列表的各项之间隔着空行，不能在这里切块
+_LIST_ITEM_RE = re.compile(r' {0,3}(?:[-+*]|\d{1,9}[.)])(?:[ \t]|$)')
+
+# 可以跨越空行的 HTML 块（CommonMark 第 1-5 类）：起始行 -> 结束标记
+_HTML_BLOCKS = (
+    (re.compile(r' {0,3}<(?:script|pre|style|textarea)(?:[\s>]|$)', re.IGNORECASE),
+     re.compile(r'</(?:script|pre|style|textarea)>', re.IGNORECASE)),
+    (re.compile(r' {0,3}<!--'), re.compile(r'-->')),
+    (re.compile(r' {0,3}<\?'), re.compile(r'\?>')),
+    (re.compile(r' {0,3}<![A-Za-z]'), re.compile(r'>')),
+    (re.compile(r' {0,3}<!\[CDATA\['), re.compile(r'\]\]>')),
+)
+
+# 链接引用定义（[label]: url），单独解析块时无法解析到其它块里的引用
+_LINK_REF_RE = re.compile(r'^ {0,3}\[[^\]]+\]:\s*\S', re.MULTILINE)
+
+# 流式刷新间隔（毫秒）：到达速度越快、内容越长，刷新越稀疏
+_FLUSH_MIN_MS = 60
+_FLUSH_MAX_MS = 250
+_FLUSH_LONG_MS = 150          # 内容较长时的最小间隔
+_FLUSH_TARGET_CPS = 38        # 不超过该速度（字符/秒）时按最小间隔刷新
+_FLUSH_LONG_CONTENT = 4000    # 超过该长度视为长内容
+_CPS_EMA_ALPHA = 0.2
+
+# 新内容以这些结尾时立即渲染（句子/行/代码块结束）
+_SENTENCE_ENDS = ('.', '!', '?', '\n', '```')
+
+# 毛玻璃背景样式模板，只需代入透明度
+_GLASS_STYLE_TEMPLATE = f"""
+    QFrame {{
+        background-color: rgba(15, 20, 30, %d);
+        border: 1px solid rgba(60, 70, 90, 0.08);
+        border-radius: {DesignTokens.radius.OVERLAY}px;
+    }}
+"""
+
+# 浮窗正文的样式（同时作为文档默认样式表，供增量插入的片段使用）
+_CONTENT_CSS = f"""
+    body {{
+        margin: 0;
+        padding: 0;
+        color: rgba(180, 190, 205, 0.85);
+        font-family: {DesignTokens.typography.FONT_FAMILY};
+        line-height: 1.55;
+    }}
+    code {{
+        background-color: rgba(40, 50, 70, 0.35);
+        padding: 2px 5px;
+        border-radius: 3px;
+        font-family: {DesignTokens.typography.FONT_FAMILY_MONO};
+        font-size: 12px;
+        color: rgba(165, 180, 195, 0.85);
+    }}
+    pre {{
+        background-color: rgba(35, 45, 65, 0.35);
+        padding: 10px 12px;
+        border-radius: 5px;
+        overflow-x: auto;
+        border: 1px solid rgba(70, 85, 105, 0.15);
+    }}
+    pre code {{
+        background: none;
+        padding: 0;
+    }}
+    a {{
+        color: rgba(120, 180, 200, 0.75);
+        text-decoration: none;
+    }}
+    a:hover {{
+        color: rgba(140, 200, 220, 0.85);
+        text-decoration: underline;
+    }}
+    h1, h2, h3, h4 {{
+        color: rgba(195, 205, 220, 0.9);
+        margin-top: 12px;
+        margin-bottom: 5px;
+        font-weight: 500;
+    }}
+    h1 {{ font-size: 16px; }}
+    h2 {{ font-size: 15px; }}
+    h3 {{ font-size: 14px; }}
+    p {{
+        margin: 5px 0;
+    }}
+    ul, ol {{
+        padding-left: 16px;
+        margin: 5px 0;
+    }}
+    li {{
+        margin: 3px 0;
+    }}
+    blockquote {{
+        border-left: 2px solid rgba(100, 120, 160, 0.4);
+        margin: 8px 0;
+        padding-left: 12px;
+        color: rgba(160, 175, 190, 0.8);
+    }}
+    strong {{
+        color: rgba(195, 205, 220, 0.9);
+        font-weight: 600;
+    }}
+    em {{
+        color: rgba(175, 188, 205, 0.85);
+    }}
+"""
+
+# 占位段落：插入片段时先与前一块合并并随后删除，保证片段首块保留自身的块格式
+_ANCHOR_HTML = "<p>\u200b</p>"
 
 
 class ModernOverlay(QtWidgets.QWidget):
@@ -23,6 +161,7 @@ class ModernOverlay(QtWidgets.QWidget):
 
     content_ready = QtCore.pyqtSignal(str)
     content_chunk = QtCore.pyqtSignal(str)
+    markdown_ready = QtCore.pyqtSignal(str)  # 完整的 markdown 响应，在主线程渲染
 
     def __init__(self, config_manager):
         super().__init__()
@@ -30,6 +169,7 @@ class ModernOverlay(QtWidgets.QWidget):
 
         # UI 组件引用
         self.background_frame = None
+        self._glass_opacity = None  # 当前已应用的背景透明度
         self.title_bar = None
         self.title_label = None
         self.loading_indicator = None
@@ -45,13 +185,28 @@ class ModernOverlay(QtWidgets.QWidget):
         self._fade_animation = None
         self._scale_animation = None
 
-        # 流式渲染状态
-        self.streaming_content = ""
+        # 流式渲染状态：完整源码以片段列表保存，避免每次刷新复制整段字符串
+        self._stream_parts: list[str] = []
+        self._stream_len = 0
+        self._tail_source = ""  # 尚未闭合的尾部源码
         self.is_streaming = False
         self.update_timer = None
         self.pending_chunks = []
         self.last_rendered_length = 0
         self.use_incremental_rendering = True
+        self._auto_scroll = False  # 内容增长时是否跟随到底部（用户向上滚动后关闭）
+        # 增量渲染：已闭合的块只解析一次并缓存 HTML，每次刷新只重新解析尾部未闭合的块
+        self._committed_html = []
+        self._committed_source_len = 0
+        self._has_link_refs = False    # 内容中出现过链接引用定义
+        self._inserted_committed = 0   # 已插入文档的已闭合块数量
+        self._tail_start = None        # 文档中尾部（未闭合块）的起始位置
+        # 到达速度（字符/秒）的指数移动平均，用于自适应刷新间隔
+        self._arrival_cps_ema = 0.0
+        self._last_chunk_time = None
+        # 复用的 markdown 渲染器（仅在主线程使用），不可用时为 None
+        self._md = MarkdownIt("commonmark", {"html": True}) if _HAS_MD else None
+        self._md_cache = MarkdownCache(maxsize=256)  # 已闭合块/示例内容的 HTML 缓存
 
         # 加载动画
         self.loading_animation = None
@@ -64,6 +219,7 @@ class ModernOverlay(QtWidgets.QWidget):
 
         self.content_ready.connect(self.handle_response, QtCore.Qt.ConnectionType.QueuedConnection)
         self.content_chunk.connect(self.append_chunk, QtCore.Qt.ConnectionType.QueuedConnection)
+        self.markdown_ready.connect(self.handle_markdown, QtCore.Qt.ConnectionType.QueuedConnection)
 
     def _setup_window_flags(self):
         """设置窗口标志"""
@@ -87,6 +243,8 @@ class ModernOverlay(QtWidgets.QWidget):
 
     def _apply_screen_capture_protection(self):
         """应用或移除截屏保护 - 根据配置动态控制"""
+        if _SetWindowDisplayAffinity is None:
+            return
         try:
             hwnd = int(self.winId())
             # WDA_EXCLUDEFROMCAPTURE = 0x11 启用保护
@@ -95,16 +253,17 @@ class ModernOverlay(QtWidgets.QWidget):
             affinity_value = 0x11 if enable_protection else 0x00
             
             # 调用 Windows API
-            result = ctypes.windll.user32.SetWindowDisplayAffinity(hwnd, affinity_value)
+            result = _SetWindowDisplayAffinity(hwnd, affinity_value)
             if result == 0:
-                print(f"SetWindowDisplayAffinity failed for HWND {hwnd}")
+                logger.warning("SetWindowDisplayAffinity failed for HWND %s (error %d)",
+                               hwnd, ctypes.get_last_error())
             else:
-                print(f"SetWindowDisplayAffinity success: {'Protected' if enable_protection else 'Unprotected'} (Affinity: {affinity_value})")
-                
+                logger.debug("SetWindowDisplayAffinity success: %s (Affinity: %#x)",
+                             "Protected" if enable_protection else "Unprotected", affinity_value)
+
         except Exception as e:
-            print(f"Failed to set window display affinity: {e}")
-            # 非 Windows 平台或 API 调用失败时静默处理
-            pass
+            # API 调用失败时静默处理
+            logger.debug("Failed to set window display affinity: %s", e)
 
     def update_capture_protection(self):
         """更新截屏保护状态 - 供外部调用"""
@@ -150,7 +309,7 @@ class ModernOverlay(QtWidgets.QWidget):
         self.loading_animation = QtCore.QTimer()
         self.loading_animation.timeout.connect(self._update_loading_animation)
 
-    def _apply_glass_style(self):
+    def _apply_glass_style(self, opacity: Optional[int] = None):
         """
         应用隐蔽效果
 
@@ -160,18 +319,15 @@ class ModernOverlay(QtWidgets.QWidget):
         - 使用者自己能清楚阅读内容
         """
         # 透明度：数值越低越透明（范围50-255）
-        # 默认120 = 约47%不透明度，非常隐蔽
-        opacity = self.config_manager.get("background_opacity", 120)
-        radius = DesignTokens.radius.OVERLAY
+        # 默认120 = 约47%不透明度，非常隐蔽；传入 opacity 时只预览，不读取配置
+        if opacity is None:
+            opacity = self.config_manager.get("background_opacity", 120)
+        if opacity == self._glass_opacity:
+            return  # 未变化时不重新设置样式表，避免整棵子控件重新计算样式
+        self._glass_opacity = opacity
 
         # 深色半透明背景，几乎没有边框
-        self.background_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: rgba(15, 20, 30, {opacity});
-                border: 1px solid rgba(60, 70, 90, 0.08);
-                border-radius: {radius}px;
-            }}
-        """)
+        self.background_frame.setStyleSheet(_GLASS_STYLE_TEMPLATE % opacity)
 
     def _build_title_bar(self, parent_layout):
         """
@@ -268,7 +424,16 @@ class ModernOverlay(QtWidgets.QWidget):
 
         # 文本浏览器 - 柔和灰色文字
         self.browser = QtWidgets.QTextBrowser()
-        self.browser.setOpenExternalLinks(True)
+        # 不在浏览器内部导航，链接交给系统浏览器打开
+        self.browser.setOpenLinks(False)
+        self.browser.anchorClicked.connect(QtGui.QDesktopServices.openUrl)
+        document = self.browser.document()
+        # 内容样式只在文档上设置一次，setHtml/insertHtml 不再重复解析内联 <style>
+        document.setDefaultStyleSheet(_CONTENT_CSS)
+        document.setUndoRedoEnabled(False)  # 只读内容，增量插入无需记录撤销栈
+        # 排版完成后再滚动到底部，不再为每次渲染单独排队定时器
+        document.documentLayout().documentSizeChanged.connect(self._on_document_size_changed)
+        self.browser.verticalScrollBar().actionTriggered.connect(self._on_scroll_action)
         self.browser.setStyleSheet(f"""
             QTextBrowser {{
                 background-color: transparent;
@@ -324,9 +489,9 @@ class ModernOverlay(QtWidgets.QWidget):
     # 公共方法
     # ─────────────────────────────────────────────────────────────
 
-    def update_background_opacity(self):
-        """更新背景透明度"""
-        self._apply_glass_style()
+    def update_background_opacity(self, opacity: Optional[int] = None):
+        """更新背景透明度；传入 opacity 时作为拖动滑块时的预览值，不修改配置"""
+        self._apply_glass_style(opacity)
 
     def set_provider(self, provider: str):
         """设置当前 AI 服务商"""
@@ -343,87 +508,28 @@ class ModernOverlay(QtWidgets.QWidget):
         - 代码：低调的青灰色
         - 整体效果：使用者能看清，旁人不易注意
         """
-        styled_html = f"""
-        <style>
-            body {{
-                margin: 0;
-                padding: 0;
-                color: rgba(180, 190, 205, 0.85);
-                font-family: {DesignTokens.typography.FONT_FAMILY};
-                line-height: 1.55;
-            }}
-            code {{
-                background-color: rgba(40, 50, 70, 0.35);
-                padding: 2px 5px;
-                border-radius: 3px;
-                font-family: {DesignTokens.typography.FONT_FAMILY_MONO};
-                font-size: 12px;
-                color: rgba(165, 180, 195, 0.85);
-            }}
-            pre {{
-                background-color: rgba(35, 45, 65, 0.35);
-                padding: 10px 12px;
-                border-radius: 5px;
-                overflow-x: auto;
-                border: 1px solid rgba(70, 85, 105, 0.15);
-            }}
-            pre code {{
-                background: none;
-                padding: 0;
-            }}
-            a {{
-                color: rgba(120, 180, 200, 0.75);
-                text-decoration: none;
-            }}
-            a:hover {{
-                color: rgba(140, 200, 220, 0.85);
-                text-decoration: underline;
-            }}
-            h1, h2, h3, h4 {{
-                color: rgba(195, 205, 220, 0.9);
-                margin-top: 12px;
-                margin-bottom: 5px;
-                font-weight: 500;
-            }}
-            h1 {{ font-size: 16px; }}
-            h2 {{ font-size: 15px; }}
-            h3 {{ font-size: 14px; }}
-            p {{
-                margin: 5px 0;
-            }}
-            ul, ol {{
-                padding-left: 16px;
-                margin: 5px 0;
-            }}
-            li {{
-                margin: 3px 0;
-            }}
-            blockquote {{
-                border-left: 2px solid rgba(100, 120, 160, 0.4);
-                margin: 8px 0;
-                padding-left: 12px;
-                color: rgba(160, 175, 190, 0.8);
-            }}
-            strong {{
-                color: rgba(195, 205, 220, 0.9);
-                font-weight: 600;
-            }}
-            em {{
-                color: rgba(175, 188, 205, 0.85);
-            }}
-        </style>
-        {html_body}
-        """
-        self.browser.setHtml(styled_html)
+        self.browser.setHtml(html_body)
         self.browser.verticalScrollBar().setValue(0)
 
     @QtCore.pyqtSlot(str)
     def handle_response(self, html: str):
         """处理 API 响应"""
+        self._auto_scroll = False
         self.set_html(html)
         if not self.isVisible():
             self.toggle()
 
+    @QtCore.pyqtSlot(str)
+    def handle_markdown(self, source: str):
+        """处理完整的 markdown 响应（渲染结果经缓存，相同响应不再重新解析）"""
+        if self._md is None:
+            self._auto_scroll = False
+            self.browser.setPlainText(source)
+            if not self.isVisible():
+                self.toggle()
+            return
+        self.handle_response(self._md_cache.render(self._md, source))
+
     def toggle(self):
         """切换显示/隐藏"""
         if self.isVisible():
@@ -457,8 +563,10 @@ def hello_world():
 
 正常使用时，这里会显示 AI 的响应内容。
 """
-        from markdown_it import MarkdownIt
-        html = MarkdownIt("commonmark", {"html": True}).render(sample_md)
+        if self._md is None:
+            self.browser.setPlainText(sample_md)
+            return
+        html = self._md_cache.render(self._md, sample_md)
         self.set_html(html)
 
     def show_at_position(self):
@@ -554,6 +662,7 @@ def hello_world():
             sb.setValue(sb.value() - sb.singleStep() * 3)
         elif delta < 0:
             sb.setValue(sb.value() + sb.singleStep() * 3)
+        self._auto_scroll = sb.value() >= sb.maximum()
         event.accept()
 
     # ─────────────────────────────────────────────────────────────
@@ -567,6 +676,7 @@ def hello_world():
                 sb = self.browser.verticalScrollBar()
                 if sb:
                     sb.setValue(sb.value() - sb.singleStep() * 3)
+                    self._auto_scroll = False
         except Exception:
             pass  # 静默处理滚动错误
 
@@ -577,9 +687,20 @@ def hello_world():
                 sb = self.browser.verticalScrollBar()
                 if sb:
                     sb.setValue(sb.value() + sb.singleStep() * 3)
+                    self._auto_scroll = sb.value() >= sb.maximum()
         except Exception:
             pass  # 静默处理滚动错误
 
+    def _on_scroll_action(self, _action):
+        """用户拖动/滚轮操作滚动条：停在底部时继续跟随，否则停止自动滚动"""
+        sb = self.browser.verticalScrollBar()
+        self._auto_scroll = sb.sliderPosition() >= sb.maximum()
+
+    def _on_document_size_changed(self, _size):
+        """文档排版尺寸变化时跟随到底部"""
+        if self._auto_scroll:
+            self._scroll_to_bottom()
+
     def _scroll_to_bottom(self):
         """滚动到底部"""
         try:
@@ -623,13 +744,20 @@ def hello_world():
     def start_streaming(self):
         """开始流式响应"""
         self.is_streaming = True
-        self.streaming_content = ""
+        self._auto_scroll = True
+        self._stream_parts.clear()
+        self._stream_len = 0
+        self._tail_source = ""
         self.pending_chunks.clear()
         self.last_rendered_length = 0
         self.use_incremental_rendering = True
-
-        if hasattr(self, 'last_rendered_content'):
-            delattr(self, 'last_rendered_content')
+        self._committed_html.clear()
+        self._committed_source_len = 0
+        self._has_link_refs = False
+        self._inserted_committed = 0
+        self._tail_start = None
+        self._arrival_cps_ema = 0.0
+        self._last_chunk_time = None
 
         if self.update_timer:
             self.update_timer.stop()
@@ -666,56 +794,220 @@ def hello_world():
         if not self.is_streaming:
             return
         self.pending_chunks.append(chunk)
-        if not self.update_timer.isActive():
-            self.update_timer.start(80)
 
-    def _process_buffered_chunks(self):
-        """处理缓冲的内容"""
+        now = time.monotonic()
+        if self._last_chunk_time is not None:
+            elapsed = now - self._last_chunk_time
+            if elapsed > 0:
+                cps = len(chunk) / elapsed
+                if self._arrival_cps_ema:
+                    cps = _CPS_EMA_ALPHA * cps + (1 - _CPS_EMA_ALPHA) * self._arrival_cps_ema
+                self._arrival_cps_ema = cps
+        self._last_chunk_time = now
+
+        if not self.update_timer.isActive():
+            self.update_timer.start(self._flush_interval_ms())
+
+    def _flush_interval_ms(self) -> int:
+        """根据到达速度和已有内容长度计算下一次刷新的间隔"""
+        if not self._committed_html:
+            # 首屏尽快显示
+            return _FLUSH_MIN_MS
+        interval = _FLUSH_MIN_MS * max(1.0, self._arrival_cps_ema / _FLUSH_TARGET_CPS)
+        if self._stream_len > _FLUSH_LONG_CONTENT:
+            interval = max(interval, _FLUSH_LONG_MS)
+        return int(min(interval, _FLUSH_MAX_MS))
+
+    def _process_buffered_chunks(self) -> bool:
+        """处理缓冲的内容，返回本次是否进行了渲染"""
         if not self.is_streaming or not self.pending_chunks:
-            return
+            return False
 
         new_content = ''.join(self.pending_chunks)
-        self.streaming_content += new_content
         self.pending_chunks.clear()
+        self._stream_parts.append(new_content)
+        self._stream_len += len(new_content)
+        self._tail_source += new_content  # 尾部只包含未闭合的块，拼接开销与总长度无关
 
-        content_length = len(self.streaming_content)
+        content_length = self._stream_len
         length_diff = content_length - self.last_rendered_length
 
         should_render = (
             length_diff >= 80 or
-            new_content.endswith(('.', '!', '?', '\n', '```')) or
+            new_content.endswith(_SENTENCE_ENDS) or
             content_length < 150
         )
 
         if should_render:
             self._render_content()
             self.last_rendered_length = content_length
+        return should_render
 
     def finish_streaming(self):
-        """完成流式响应"""
-        self.is_streaming = False
+        """完成流式响应：先处理剩余缓冲，只有最终内容尚未显示时才再渲染一次"""
         self._stop_loading_animation()
 
         if self.update_timer and self.update_timer.isActive():
             self.update_timer.stop()
 
+        # 需在 is_streaming 置为 False 之前处理，否则剩余的缓冲内容会被丢弃
         if self.pending_chunks:
             self._process_buffered_chunks()
+        self.is_streaming = False
+
+        if self._has_link_refs or _LINK_REF_RE.search(self._tail_source):
+            # 链接引用可能出现在定义之前的块里，按块解析无法解析，结束时整体渲染一次
+            self._render_full_document()
+        elif self.last_rendered_length != self._stream_len or not self._stream_len:
+            self._render_content()
+        self.last_rendered_length = self._stream_len
+
+    def _full_source(self) -> str:
+        """拼接完整的流式源码（仅在需要时生成）"""
+        if len(self._stream_parts) > 1:
+            self._stream_parts[:] = ["".join(self._stream_parts)]
+        return self._stream_parts[0] if self._stream_parts else ""
+
+    def _split_closed_blocks(self) -> list[str]:
+        """
+        从尾部源码中切出已经闭合的块
 
-        self._render_content()
+        块边界只取围栏代码块和跨空行的 HTML 块之外的空行，且下一行已开始、不是缩进续行、
+        也不是同一列表的下一项，绝不在任意字符位置切分，保证每个块可以独立解析。
+        切出的块从尾部移除，返回这些块的源码。
+        """
+        text = self._tail_source
+        pos = block_start = 0
+        fence = None
+        html_end = None   # 未闭合 HTML 块的结束标记
+        in_list = False   # 当前块中出现过列表项
+        prev_blank = False
+        blocks = []
+
+        while True:
+            nl = text.find("\n", pos)
+            if nl == -1:
+                break
+            line = text[pos:nl]
+            stripped = line.strip()
+
+            if fence:
+                # 闭合围栏：同种字符且长度不小于起始围栏
+                if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                    fence = None
+                prev_blank = False
+            elif html_end:
+                if html_end.search(line):
+                    html_end = None
+                prev_blank = False
+            else:
+                blank = not stripped
+                list_item = not blank and _LIST_ITEM_RE.match(line) is not None
+                if (prev_blank and not blank and line[0] not in " \t"
+                        and not (in_list and list_item)):
+                    block = text[block_start:pos]
+                    if block.strip():
+                        blocks.append(block)
+                    block_start = pos
+                    in_list = False
+                in_list = in_list or list_item
+                match = _FENCE_RE.match(line)
+                if match:
+                    fence = match.group(1)
+                else:
+                    for start_re, end_re in _HTML_BLOCKS:
+                        start = start_re.match(line)
+                        if start:
+                            if not end_re.search(line, start.end()):
+                                html_end = end_re
+                            break
+                prev_blank = blank
+            pos = nl + 1
+
+        if block_start:
+            self._committed_source_len += block_start
+            self._tail_source = text[block_start:]
+        return blocks
+
+    def _append_rendered_content(self, blocks: list[str]):
+        """逐块渲染已闭合的块并追加到已提交的 HTML"""
+        for block in blocks:
+            if not self._has_link_refs and _LINK_REF_RE.search(block):
+                self._has_link_refs = True
+            self._committed_html.append(self._md_cache.render(self._md, block))
 
     def _render_content(self):
-        """渲染内容"""
+        """渲染内容：已闭合块复用缓存的 HTML，只重新解析尾部"""
+        if self._md is None:
+            self.browser.setPlainText(self._full_source())
+            return
         try:
-            from markdown_it import MarkdownIt
-            html = MarkdownIt("commonmark", {"html": True}).render(self.streaming_content)
-            self.set_html(html)
-            self.last_rendered_content = self.streaming_content
-            QtCore.QTimer.singleShot(30, self._scroll_to_bottom)
+            self._append_rendered_content(self._split_closed_blocks())
+            pending = self._tail_source
+            pending_html = self._md.render(pending) if pending.strip() else ""
+            if self.use_incremental_rendering:
+                self._update_document(pending_html)
+            else:
+                self.set_html("".join(self._committed_html) + pending_html)
         except Exception:
-            self.browser.setPlainText(self.streaming_content)
+            self.browser.setPlainText(self._full_source())
             self.use_incremental_rendering = False
 
+    def _render_full_document(self):
+        """整体解析并渲染完整源码"""
+        if self._md is None:
+            self.browser.setPlainText(self._full_source())
+            return
+        self.set_html(self._md_cache.render(self._md, self._full_source()))
+        self._tail_start = None
+
+    def _update_document(self, pending_html: str):
+        """
+        增量更新文档
+
+        新闭合的块追加到已有内容之后，只替换尾部区域，已排版的块保持不动。
+        """
+        new_html = "".join(self._committed_html[self._inserted_committed:])
+        self._inserted_committed = len(self._committed_html)
+
+        if self._tail_start is None:
+            # 首次渲染：整体替换"处理中"提示
+            if not new_html:
+                self.set_html(pending_html)
+                return
+            self.set_html(new_html)
+            cursor = QtGui.QTextCursor(self.browser.document())
+            cursor.beginEditBlock()
+            cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+        else:
+            cursor = QtGui.QTextCursor(self.browser.document())
+            cursor.beginEditBlock()
+            cursor.setPosition(self._tail_start)
+            block_format = cursor.blockFormat()
+            cursor.movePosition(QtGui.QTextCursor.MoveOperation.End, QtGui.QTextCursor.MoveMode.KeepAnchor)
+            cursor.removeSelectedText()
+            # 尾部起点位于空块时，删除会让该块继承被删块的格式，这里恢复
+            cursor.setBlockFormat(block_format)
+            if new_html:
+                self._insert_html(cursor, new_html)
+
+        self._tail_start = cursor.position()
+        if pending_html:
+            self._insert_html(cursor, pending_html)
+        cursor.endEditBlock()
+
+    @staticmethod
+    def _insert_html(cursor: QtGui.QTextCursor, html: str):
+        """在文档末尾追加 HTML 片段，保留片段首块的格式且不改动前一块"""
+        pos = cursor.position()
+        block_format = cursor.blockFormat()
+        cursor.insertHtml(_ANCHOR_HTML + html.rstrip())
+        cursor.setPosition(pos)
+        cursor.setPosition(pos + 1, QtGui.QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        cursor.setBlockFormat(block_format)
+        cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+
 
 # 保持向后兼容
 Overlay = ModernOverlay
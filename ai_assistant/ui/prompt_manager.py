@@ -5,6 +5,7 @@ from __future__ import annotations
 from PyQt6 import QtCore, QtWidgets, QtGui
 
 from ..core.config_manager import ConfigManager
+from ..core.config_models import PromptConfig
 from ..core.log_manager import LogManager
 from ..core.hotkey_config import HotkeyConfig
 from .modern_ui import (
@@ -65,6 +66,7 @@ class PromptManagerWidget(QtWidgets.QWidget):
         self.config_manager = config_manager
         self.log_manager = log_manager
         self._current_edit_index = -1  # 当前编辑的提示词索引，-1表示新建模式
+        self._prompts_by_hotkey: dict[str, int] = {}  # 标准化快捷键 -> 提示词索引
         self._setup_ui()
         self.load_prompts_list()
 
@@ -140,7 +142,12 @@ class PromptManagerWidget(QtWidgets.QWidget):
         # 内容
         self.prompt_content_edit = ModernTextEdit("请输入详细的提示词内容...")
         self.prompt_content_edit.setMinimumHeight(140)
-        self.prompt_content_edit.textChanged.connect(self.update_char_count)
+        # 输入时延迟统计字符数，连续键入只在停顿后更新一次
+        self._char_count_timer = QtCore.QTimer(self)
+        self._char_count_timer.setSingleShot(True)
+        self._char_count_timer.setInterval(100)
+        self._char_count_timer.timeout.connect(self.update_char_count)
+        self.prompt_content_edit.textChanged.connect(self._char_count_timer.start)
         edit_card.add_widget(FormRow("提示词内容", self.prompt_content_edit))
 
         # 字符计数
@@ -191,12 +198,7 @@ class PromptManagerWidget(QtWidgets.QWidget):
 
     def _get_used_hotkeys(self, exclude_index: int = -1) -> list:
         """获取已使用的快捷键列表"""
-        prompts = self.config_manager.get("prompts", [])
-        used = []
-        for i, prompt in enumerate(prompts):
-            if i != exclude_index:
-                used.append(prompt.get('hotkey', ''))
-        return used
+        return [hotkey for hotkey, i in self._prompts_by_hotkey.items() if i != exclude_index]
 
     def _update_hotkey_combo(self, current_hotkey: str = ""):
         """更新快捷键下拉框选项"""
@@ -251,14 +253,19 @@ class PromptManagerWidget(QtWidgets.QWidget):
         # 添加"新建"选项
         self.prompts_combo.addItem("➕ 新建提示词...", None)
 
-        prompts = self.config_manager.get("prompts", [])
+        self._prompts_by_hotkey.clear()
+        # 直接使用配置对象中的 PromptConfig 实例，不再经由扁平字典复制一份
+        prompts = self.config_manager.get_app_config().prompts
         for i, prompt in enumerate(prompts):
-            hotkey_display = prompt['hotkey'].upper().replace("+", "+")
-            item_text = f"{prompt['name']} ({hotkey_display})"
+            normalized = HotkeyConfig.normalize_hotkey(prompt.hotkey)
+            if normalized:
+                self._prompts_by_hotkey[normalized] = i
+            item_text = f"{prompt.name} ({prompt.hotkey.upper()})"
             self.prompts_combo.addItem(item_text, {"index": i, "prompt": prompt})
 
         self.prompts_combo.blockSignals(False)
-        self.prompts_combo.setCurrentIndex(0)
+        # start_new_prompt 会在屏蔽信号的情况下选中"新建"项，这里不再通过
+        # setCurrentIndex 触发 on_prompt_selected，避免编辑区被重复刷新两次
         self.start_new_prompt()
 
     def on_prompt_selected(self, index):
@@ -273,9 +280,9 @@ class PromptManagerWidget(QtWidgets.QWidget):
             prompt = data["prompt"]
             self._current_edit_index = data["index"]
 
-            self.prompt_name_edit.setText(prompt['name'])
-            self._update_hotkey_combo(prompt['hotkey'])
-            self.prompt_content_edit.setPlainText(prompt['content'])
+            self.prompt_name_edit.setText(prompt.name)
+            self._update_hotkey_combo(prompt.hotkey)
+            self.prompt_content_edit.setPlainText(prompt.content)
             self.update_char_count()
 
             self._set_edit_mode()
@@ -338,23 +345,27 @@ class PromptManagerWidget(QtWidgets.QWidget):
             ProtectedMessageBox.warning(self, "提示", "请选择快捷键")
             return
 
+        if not HotkeyConfig.is_valid_hotkey(hotkey):
+            ProtectedMessageBox.warning(self, "提示", f"快捷键格式无效: {hotkey}")
+            return
+        # 以标准形式保存，避免 shift+ctrl+a 与 ctrl+shift+a 被视为不同快捷键
+        hotkey = HotkeyConfig.normalize_hotkey(hotkey)
+
+        owner = self._prompts_by_hotkey.get(hotkey, self._current_edit_index)
+        if owner != self._current_edit_index:
+            ProtectedMessageBox.warning(self, "提示", f"快捷键 {hotkey.upper()} 已被其他提示词使用")
+            return
+
         if not content:
             ProtectedMessageBox.warning(self, "提示", "请输入提示词内容")
             self.prompt_content_edit.setFocus()
             return
 
-        prompts = self.config_manager.get("prompts", [])
-
-        new_prompt = {
-            "name": name,
-            "hotkey": hotkey,
-            "content": content
-        }
+        new_prompt = PromptConfig(name=name, hotkey=hotkey, content=content)
 
         if self._current_edit_index == -1:
             # 新建模式
-            prompts.append(new_prompt)
-            self.config_manager.set("prompts", prompts)
+            self.config_manager.append_prompt(new_prompt)
             self.log_manager.add_log(f"添加提示词: {name} ({hotkey})")
             ProtectedMessageBox.information(
                 self, "成功",
@@ -364,8 +375,7 @@ class PromptManagerWidget(QtWidgets.QWidget):
             )
         else:
             # 编辑模式
-            prompts[self._current_edit_index] = new_prompt
-            self.config_manager.set("prompts", prompts)
+            self.config_manager.patch_prompt(self._current_edit_index, new_prompt)
             self.log_manager.add_log(f"更新提示词: {name} ({hotkey})")
             ProtectedMessageBox.information(self, "成功", f"已更新提示词「{name}」")
 
@@ -377,31 +387,31 @@ class PromptManagerWidget(QtWidgets.QWidget):
             ProtectedMessageBox.warning(self, "提示", "请先选择要删除的提示词")
             return
 
-        prompts = self.config_manager.get("prompts", [])
+        prompts = self.config_manager.get_app_config().prompts
         if self._current_edit_index < len(prompts):
-            name = prompts[self._current_edit_index]['name']
-            hotkey = prompts[self._current_edit_index]['hotkey']
+            prompt = prompts[self._current_edit_index]
+            name, hotkey = prompt.name, prompt.hotkey
 
             if ProtectedMessageBox.question(
                 self, "确认删除",
                 f"确定要删除提示词「{name}」吗？\n\n"
                 f"快捷键 {hotkey.upper()} 将被释放，可用于新提示词。"
             ):
-                prompts.pop(self._current_edit_index)
-                self.config_manager.set("prompts", prompts)
+                self.config_manager.remove_prompt(self._current_edit_index)
                 self.log_manager.add_log(f"删除提示词: {name}")
                 ProtectedMessageBox.information(self, "成功", f"已删除提示词「{name}」")
                 self.load_prompts_list()
 
     def update_char_count(self):
         """更新字符计数"""
-        count = len(self.prompt_content_edit.toPlainText())
+        self._char_count_timer.stop()
+        # characterCount 包含末尾的段落分隔符，无需把整段文本转换为字符串
+        count = self.prompt_content_edit.document().characterCount() - 1
         self.char_count_label.setText(f"字符数: {count}")
 
     def show_hotkey_help(self):
         """显示快捷键说明"""
-        prompts = self.config_manager.get("prompts", [])
-        used_count = len(prompts)
+        used_count = len(self.config_manager.get_app_config().prompts)
         available_count = 9 - used_count
 
         help_text = f"""快捷键说明：
@@ -29,6 +29,7 @@ class ScreenshotSelector(QtWidgets.QWidget):
         self.screenshot_buffer = None  # 全屏截图缓存
         self.selection_confirmed = False  # 是否已确认选择
         self.scale_factor = 1.0  # DPI缩放比例
+        self._finished = False  # 是否已发出完成/取消信号（每次截图只发一次）
 
         self.setup_ui()
 
@@ -66,16 +67,19 @@ class ScreenshotSelector(QtWidgets.QWidget):
         with mss() as sct:
             monitor = sct.monitors[1]  # 主显示器
             screenshot = sct.grab(monitor)
-            # 转换为Qt格式
-            img_bytes = QtCore.QByteArray(screenshot.rgb)
+            # 转换为Qt格式：QImage 直接引用 rgb 缓冲区，不再额外拷贝一份整屏数据
+            # rgb 需在 fromImage 完成前保持存活
+            rgb = screenshot.rgb
             qimg = QtGui.QImage(
-                img_bytes,
+                rgb,
                 screenshot.width,
                 screenshot.height,
+                screenshot.width * 3,
                 QtGui.QImage.Format.Format_RGB888
             )
             # 创建pixmap并缩放到逻辑尺寸
             pixmap = QtGui.QPixmap.fromImage(qimg)
+            del qimg, rgb
 
             # 如果有DPI缩放，调整显示大小
             if self.scale_factor != 1.0:
@@ -118,6 +122,28 @@ class ScreenshotSelector(QtWidgets.QWidget):
         self.is_selecting = False
         self.selection_confirmed = False
 
+    def _emit_taken(self, png_data: bytes):
+        if not self._finished:
+            self._finished = True
+            self.screenshot_taken.emit(png_data)
+
+    def _emit_cancelled(self):
+        if not self._finished:
+            self._finished = True
+            self.screenshot_cancelled.emit()
+
+    def _grab(self, monitor) -> Optional[bytes]:
+        """抓取屏幕区域并编码为 PNG，失败时发出取消信号并返回 None"""
+        try:
+            with mss() as sct:
+                screenshot = sct.grab(monitor if monitor is not None else sct.monitors[1])
+                return tools.to_png(screenshot.rgb, screenshot.size)
+        except Exception as e:
+            print(f"截图失败: {e}")
+            self._emit_cancelled()
+            self.close()
+            return None
+
     def on_wait_timeout(self):
         """等待超时 - 全屏截图"""
         if not self.is_selecting and not self.selection_confirmed:
@@ -126,12 +152,11 @@ class ScreenshotSelector(QtWidgets.QWidget):
 
     def capture_fullscreen(self):
         """全屏截图"""
-        with mss() as sct:
-            monitor = sct.monitors[1]
-            screenshot = sct.grab(monitor)
-            png_data = tools.to_png(screenshot.rgb, screenshot.size)
+        png_data = self._grab(None)
+        if png_data is None:
+            return
 
-        self.screenshot_taken.emit(png_data)
+        self._emit_taken(png_data)
         self.close()
 
     def capture_region(self, x1: int, y1: int, x2: int, y2: int):
@@ -150,21 +175,21 @@ class ScreenshotSelector(QtWidgets.QWidget):
         height = abs(y2_scaled - y1_scaled)
 
         if width < 1 or height < 1:
-            self.screenshot_cancelled.emit()
+            self._emit_cancelled()
             self.close()
             return
 
-        with mss() as sct:
-            monitor = {
-                "left": left,
-                "top": top,
-                "width": width,
-                "height": height
-            }
-            screenshot = sct.grab(monitor)
-            png_data = tools.to_png(screenshot.rgb, screenshot.size)
+        monitor = {
+            "left": left,
+            "top": top,
+            "width": width,
+            "height": height
+        }
+        png_data = self._grab(monitor)
+        if png_data is None:
+            return
 
-        self.screenshot_taken.emit(png_data)
+        self._emit_taken(png_data)
         self.close()
 
     def paintEvent(self, event):
@@ -286,7 +311,7 @@ class ScreenshotSelector(QtWidgets.QWidget):
             if self.confirm_timer and self.confirm_timer.isActive():
                 self.confirm_timer.stop()
 
-            self.screenshot_cancelled.emit()
+            self._emit_cancelled()
             self.close()
 
         elif event.key() == QtCore.Qt.Key.Key_Return or event.key() == QtCore.Qt.Key.Key_Enter:
@@ -304,4 +329,6 @@ class ScreenshotSelector(QtWidgets.QWidget):
         if self.confirm_timer and self.confirm_timer.isActive():
             self.confirm_timer.stop()
 
+        # 被 Alt+F4、窗口管理器等关闭且尚未给出结果时，按取消处理
+        self._emit_cancelled()
         event.accept()
\ No newline at end of file
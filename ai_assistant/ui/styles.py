@@ -15,6 +15,7 @@ class AppStyles:
     """应用程序样式类，支持从外部QSS资源加载样式。"""
 
     _RESOURCE_DIR = Path(__file__).resolve().parent / "resources"
+    _STYLESHEET_CACHE = {}  # 文件名 -> 样式表内容，只读取一次磁盘
 
     # 使用设计令牌构建现代化样式
     _MAIN_WINDOW_FALLBACK = f"""
@@ -556,12 +557,17 @@ class AppStyles:
 
     @classmethod
     def _load_stylesheet(cls, filename: str, fallback: str) -> str:
-        """从文件加载样式表，失败时返回内置样式"""
+        """从文件加载样式表，失败时返回内置样式（结果按文件名缓存）"""
+        cached = cls._STYLESHEET_CACHE.get(filename)
+        if cached is not None:
+            return cached
         path = cls._RESOURCE_DIR / filename
         try:
-            return path.read_text(encoding="utf-8")
+            stylesheet = path.read_text(encoding="utf-8")
         except FileNotFoundError:
-            return fallback
+            stylesheet = fallback
+        cls._STYLESHEET_CACHE[filename] = stylesheet
+        return stylesheet
 
     @classmethod
     def get_main_window_style(cls) -> str:
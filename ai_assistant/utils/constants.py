@@ -2,6 +2,8 @@
 应用程序常量定义
 """
 
+from types import MappingProxyType
+
 # 应用程序信息
 APP_NAME = "AIScreenshotAssistant"
 APP_VERSION = "2.0.0"
@@ -25,14 +27,27 @@ CONFIG_WINDOW_HEIGHT = 800
 MAX_SCREENSHOT_HISTORY = 10
 MAX_LOG_ENTRIES = 1000
 
+# 配置保存
+SAVE_DEBOUNCE_SECONDS = 0.5  # 合并连续修改，延迟写盘
+MAX_CONFIG_BACKUPS = 10  # 迁移备份目录最多保留的备份数
+
 # 日志配置
 LOG_RETENTION_DAYS = 7
+LOG_EMIT_INTERVAL_MS = 50  # 日志信号合并发射间隔
 SHOW_LOG_TAB = True  # 是否显示日志选项卡
 
 # API提供商配置
 AVAILABLE_PROVIDERS = ["Gemini", "GPT"]
 DEFAULT_PROVIDER = "Gemini"
 
+# 服务商默认值（配置模型和旧版配置迁移共用，列表默认值使用时需复制为 list）
+DEFAULT_GEMINI_MODEL = "gemini-2.5-flash"
+DEFAULT_GEMINI_BASE_URL = "https://generativelanguage.googleapis.com"
+DEFAULT_GEMINI_MODELS = ("gemini-2.5-flash", "gemini-2.5-pro")
+DEFAULT_GPT_MODEL = "gpt-4o"
+DEFAULT_GPT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_GPT_MODELS = ("gpt-4o", "gpt-4o-mini")
+
 # 通用API配置（这些是程序运行参数，非模型配置）
 API_TIMEOUT = 30
 MAX_RETRIES = 3
@@ -50,14 +65,14 @@ MAX_THUMBNAIL_SIZE = (1920, 1080)
 SUPPORTED_PROXY_SCHEMES = ["http", "https", "socks5"]
 MIN_API_KEY_LENGTH = 20
 
-# 默认热键
-DEFAULT_HOTKEYS = {
+# 默认热键（只读）
+DEFAULT_HOTKEYS = MappingProxyType({
     "toggle": "alt+q",
     "screenshot_only": "alt+w",
     "clear_screenshots": "alt+v",
     "scroll_up": "alt+up",
     "scroll_down": "alt+down"
-}
+})
 
 # 默认提示词（将从配置文件读取，这里留空）
 DEFAULT_PROMPTS = []
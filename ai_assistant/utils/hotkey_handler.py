@@ -3,10 +3,57 @@
 处理全局热键的解析、绑定和管理
 """
 
-from typing import List, Dict, Set, Callable, Optional, Tuple
+from functools import lru_cache
+from typing import Any, List, Dict, Set, Callable, Optional, Tuple
 from pynput.keyboard import Key, KeyCode, Listener, HotKey
 
 
+# 特殊键名 -> pynput 键，按字典一次查找代替逐个比较
+_KEY_TABLE: Dict[str, Key] = {
+    'ctrl': Key.ctrl_l,
+    'alt': Key.alt_l,
+    'shift': Key.shift_l,
+    'cmd': Key.cmd,
+    'win': Key.cmd,
+    'up': Key.up,
+    'down': Key.down,
+    'left': Key.left,
+    'right': Key.right,
+    'space': Key.space,
+    'enter': Key.enter,
+    'tab': Key.tab,
+    'esc': Key.esc,
+    'backspace': Key.backspace,
+    'delete': Key.delete,
+    'home': Key.home,
+    'end': Key.end,
+    'pageup': Key.page_up,
+    'pagedown': Key.page_down,
+}
+
+
+@lru_cache(maxsize=128)
+def _parse_hotkey(hotkey_str: str) -> Tuple:
+    """解析快捷键字符串（结果缓存；键对象是常量，返回不可变的元组）"""
+    keys = []
+
+    for part in hotkey_str.lower().split('+'):
+        part = part.strip()
+        key = _KEY_TABLE.get(part)
+        if key is None:
+            if len(part) == 1:
+                key = KeyCode.from_char(part)
+            else:
+                # 功能键 F1-F12 及其它特殊键
+                key = getattr(Key, part, None)
+                if key is None:
+                    print(f"未知的键: {part}")
+                    continue
+        keys.append(key)
+
+    return tuple(keys)
+
+
 class HotkeyConflictError(Exception):
     """热键冲突异常"""
     def __init__(self, hotkey: str, existing_name: str):
@@ -18,70 +65,17 @@ class HotkeyConflictError(Exception):
 class HotkeyHandler:
     def __init__(self):
         self.keyboard_listener = None
+        self._running = False  # 由 start/stop 维护，查询时不访问 pynput 监听线程的状态
         self.hotkeys: Dict[str, HotKey] = {}
         self.hotkey_names: Dict[str, str] = {}  # hotkey_str -> name 映射
         self.pressed_keys: Set = set()
+        self._track_pressed = False  # 仅在有调用方需要 pressed_keys 时才维护
+        # 键 -> 包含该键的热键；值为元组，注册/注销时整体替换，监听线程遍历时无需加锁
+        self._key_index: Dict[Any, Tuple[HotKey, ...]] = {}
 
     def parse_hotkey(self, hotkey_str: str) -> List:
         """解析快捷键字符串为pynput格式"""
-        parts = hotkey_str.lower().split('+')
-        keys = []
-
-        for part in parts:
-            part = part.strip()
-            if part == 'ctrl':
-                keys.append(Key.ctrl_l)
-            elif part == 'alt':
-                keys.append(Key.alt_l)
-            elif part == 'shift':
-                keys.append(Key.shift_l)
-            elif part == 'cmd' or part == 'win':
-                keys.append(Key.cmd)
-            elif part == 'up':
-                keys.append(Key.up)
-            elif part == 'down':
-                keys.append(Key.down)
-            elif part == 'left':
-                keys.append(Key.left)
-            elif part == 'right':
-                keys.append(Key.right)
-            elif part == 'space':
-                keys.append(Key.space)
-            elif part == 'enter':
-                keys.append(Key.enter)
-            elif part == 'tab':
-                keys.append(Key.tab)
-            elif part == 'esc':
-                keys.append(Key.esc)
-            elif part == 'backspace':
-                keys.append(Key.backspace)
-            elif part == 'delete':
-                keys.append(Key.delete)
-            elif part == 'home':
-                keys.append(Key.home)
-            elif part == 'end':
-                keys.append(Key.end)
-            elif part == 'pageup':
-                keys.append(Key.page_up)
-            elif part == 'pagedown':
-                keys.append(Key.page_down)
-            elif part.startswith('f') and part[1:].isdigit():
-                # 功能键 F1-F12
-                try:
-                    keys.append(getattr(Key, part))
-                except AttributeError:
-                    print(f"未知的功能键: {part}")
-            elif len(part) == 1:
-                keys.append(KeyCode.from_char(part))
-            else:
-                # 尝试作为特殊键处理
-                try:
-                    keys.append(getattr(Key, part))
-                except AttributeError:
-                    print(f"未知的键: {part}")
-                    continue
-
-        return keys
+        return list(_parse_hotkey(hotkey_str))
 
     def normalize_hotkey(self, hotkey_str: str) -> str:
         """标准化热键字符串（用于比较）"""
@@ -141,10 +135,13 @@ class HotkeyHandler:
                 if conflict_name:
                     raise HotkeyConflictError(hotkey_str, conflict_name)
 
-            keys = self.parse_hotkey(hotkey_str)
+            keys = _parse_hotkey(hotkey_str)
             if keys:
-                hotkey = HotKey(keys, callback)
+                hotkey = HotKey(list(keys), callback)
+                self._unindex(hotkey_str)
                 self.hotkeys[hotkey_str] = hotkey
+                for key in set(keys):
+                    self._key_index[key] = self._key_index.get(key, ()) + (hotkey,)
                 if name:
                     self.hotkey_names[hotkey_str] = name
                 return True
@@ -154,9 +151,23 @@ class HotkeyHandler:
             print(f"注册热键失败 {hotkey_str}: {e}")
         return False
 
+    def _unindex(self, hotkey_str: str) -> None:
+        """从键索引中移除已注册的热键"""
+        hotkey = self.hotkeys.get(hotkey_str)
+        if hotkey is None:
+            return
+        for key, hotkeys in list(self._key_index.items()):
+            if hotkey in hotkeys:
+                remaining = tuple(h for h in hotkeys if h is not hotkey)
+                if remaining:
+                    self._key_index[key] = remaining
+                else:
+                    del self._key_index[key]
+
     def unregister_hotkey(self, hotkey_str: str) -> None:
         """注销热键"""
         if hotkey_str in self.hotkeys:
+            self._unindex(hotkey_str)
             del self.hotkeys[hotkey_str]
         if hotkey_str in self.hotkey_names:
             del self.hotkey_names[hotkey_str]
@@ -164,6 +175,7 @@ class HotkeyHandler:
     def clear_hotkeys(self) -> None:
         """清空所有热键"""
         self.hotkeys.clear()
+        self._key_index.clear()
         self.hotkey_names.clear()
         self.pressed_keys.clear()
 
@@ -203,30 +215,36 @@ class HotkeyHandler:
 
         return True, ""
 
+    def enable_press_tracking(self, enabled: bool = True) -> None:
+        """开启/关闭 pressed_keys 的维护（默认关闭，避免每次按键都更新集合）"""
+        self._track_pressed = enabled
+        if not enabled:
+            self.pressed_keys.clear()
+
     def on_key_press(self, key):
         """键盘按下事件处理"""
-        try:
+        if self._track_pressed:
             self.pressed_keys.add(key)
-            # 通知所有热键有键被按下
-            for hotkey in self.hotkeys.values():
+        # 只通知包含该键的热键
+        for hotkey in self._key_index.get(key, ()):
+            try:
+                # 组合键完成时会在监听线程中执行回调，回调出错不能让监听线程退出
                 hotkey.press(key)
-        except Exception:
-            pass  # 忽略键盘事件处理错误
+            except Exception as e:
+                print(f"热键回调执行失败: {e}")
 
     def on_key_release(self, key):
         """键盘释放事件处理"""
-        try:
+        if self._track_pressed:
             self.pressed_keys.discard(key)
-            # 通知所有热键有键被释放
-            for hotkey in self.hotkeys.values():
-                hotkey.release(key)
-        except Exception:
-            pass  # 忽略键盘事件处理错误
+        # 只通知包含该键的热键（release 只更新按键状态，不会执行回调）
+        for hotkey in self._key_index.get(key, ()):
+            hotkey.release(key)
 
     def start_listening(self) -> bool:
         """启动键盘监听"""
         try:
-            if self.keyboard_listener and self.keyboard_listener.running:
+            if self._running:
                 return True
 
             self.keyboard_listener = Listener(
@@ -236,6 +254,7 @@ class HotkeyHandler:
             # 设置为守护线程,确保程序退出时线程自动终止
             self.keyboard_listener.daemon = True
             self.keyboard_listener.start()
+            self._running = True
             return True
         except Exception as e:
             print(f"启动键盘监听失败: {e}")
@@ -244,9 +263,10 @@ class HotkeyHandler:
     def stop_listening(self) -> None:
         """停止键盘监听"""
         try:
-            if self.keyboard_listener and self.keyboard_listener.running:
+            if self._running:
                 self.keyboard_listener.stop()
                 self.keyboard_listener = None
+                self._running = False
 
             self.clear_hotkeys()
         except Exception as e:
@@ -254,5 +274,4 @@ class HotkeyHandler:
 
     def is_listening(self) -> bool:
         """检查是否正在监听"""
-        return (self.keyboard_listener is not None and
-                self.keyboard_listener.running)
\ No newline at end of file
+        return self._running
\ No newline at end of file
@@ -6,6 +6,19 @@
 import re
 from mss import mss, tools
 import pyperclip
+from PyQt6 import QtCore, QtGui
+
+
+# 匹配代码块的正则表达式 - 合并为一个分支表达式，单次扫描全文
+# 分支按优先级排序：先匹配长的，再匹配短的，避免冲突；第 N 个分组对应第 N 种代码块
+_CODE_BLOCK_RE = re.compile(
+    r'```[a-zA-Z0-9+#-]*\n?(.*?)```'    # 标准三个反引号（包含语言标识）
+    r'|~~~[a-zA-Z0-9+#-]*\n?(.*?)~~~'   # 波浪线代码块
+    r'|(?<!`)``([^`\n]+?)``(?!`)'        # 双反引号（前后不能有反引号）
+    r'|(?<!`)`([^`\n]{20,})`(?!`)',      # 长内联代码（至少20字符，前后不能有反引号）
+    re.DOTALL
+)
+_CODE_BLOCK_KINDS = 4
 
 
 class ScreenshotError(Exception):
@@ -51,36 +64,27 @@ def extract_code_blocks(markdown_text: str) -> str:
     if not markdown_text:
         return ""
 
-    # 匹配代码块的正则表达式 - 避免重复匹配
-    # 按优先级排序：先匹配长的，再匹配短的，避免冲突
-    patterns = [
-        r'```[a-zA-Z0-9+#-]*\n?(.*?)```',  # 标准三个反引号（包含语言标识）
-        r'~~~[a-zA-Z0-9+#-]*\n?(.*?)~~~',  # 波浪线代码块
-        r'(?<!`)``([^`\n]+?)``(?!`)',       # 双反引号（前后不能有反引号）
-        r'(?<!`)`([^`\n]{20,})`(?!`)',      # 长内联代码（至少20字符，前后不能有反引号）
-    ]
-
-    all_matches = []
-    for pattern in patterns:
-        matches = re.findall(pattern, markdown_text, re.DOTALL)
-        all_matches.extend(matches)
+    # 按代码块类型分桶，保持“围栏代码块优先、内联代码在后”的输出顺序
+    buckets = [[] for _ in range(_CODE_BLOCK_KINDS)]
+    for match in _CODE_BLOCK_RE.finditer(markdown_text):
+        kind = match.lastindex
+        buckets[kind - 1].append(match.group(kind))
+    all_matches = [text for bucket in buckets for text in bucket]
 
     if all_matches:
         # 将所有代码块合并，用换行分隔，过滤空的匹配和重复内容
         valid_matches = []
-        seen_hashes = set()
+        seen = set()
 
         for match in all_matches:
             match_text = match.strip()
             if not match_text:
                 continue
 
-            # 使用哈希值去重
-            import hashlib
-            match_hash = hashlib.md5(match_text.encode()).hexdigest()
-            if match_hash not in seen_hashes:
+            # 字符串本身可哈希，直接用集合去重
+            if match_text not in seen:
                 valid_matches.append(match_text)
-                seen_hashes.add(match_hash)
+                seen.add(match_text)
 
         if valid_matches:
             code_content = '\n\n'.join(valid_matches)
@@ -134,9 +138,13 @@ def _looks_like_code(text: str) -> bool:
 
 
 def copy_to_clipboard(text: str) -> bool:
-    """复制文本到剪贴板"""
+    """复制文本到剪贴板（在 GUI 线程上直接使用 Qt 剪贴板，其余情况回退到 pyperclip）"""
     try:
-        pyperclip.copy(text)
+        app = QtGui.QGuiApplication.instance()
+        if app is not None and app.thread() == QtCore.QThread.currentThread():
+            app.clipboard().setText(text)
+        else:
+            pyperclip.copy(text)
         return True
     except Exception:
         return False
\ No newline at end of file
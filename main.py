@@ -8,8 +8,7 @@ import sys
 import os
 import signal
 import threading
-import gc
-from PyQt6 import QtCore, QtGui, QtWidgets
+from PyQt6 import QtCore, QtGui, QtWidgets, sip
 
 # 导入模块化组件
 from ai_assistant.core.single_instance import SingleInstance
@@ -76,7 +75,7 @@ class AIAssistantApp(QtWidgets.QMainWindow):
     """主应用程序类"""
 
     # 定义信号，用于在主线程中处理操作
-    trigger_screenshot_signal = QtCore.pyqtSignal(bool)  # True为带提示词，False为纯截图
+    trigger_screenshot_signal = QtCore.pyqtSignal(object)  # 提示词字典为带提示词截图，None为纯截图
     toggle_overlay_signal = QtCore.pyqtSignal()  # 切换浮窗显示
     toggle_provider_signal = QtCore.pyqtSignal()  # 切换AI服务商
     api_response_signal = QtCore.pyqtSignal(str)  # API响应信号
@@ -92,7 +91,9 @@ class AIAssistantApp(QtWidgets.QMainWindow):
         self.ai_factory = AIServiceFactory(config_manager, log_manager)
         self.hotkey_handler = HotkeyHandler()
         self.screenshot_history = []
+        self._history_bytes = 0  # 截图历史总字节数，随追加/移除增量维护
         self.screenshot_selector = None  # 截图选择器实例
+        self._capture_lock = threading.Lock()  # 同一时间只允许一次传统截图
         self.pending_prompt = None  # 待处理的提示词
         self.current_prompt_index = self.config_manager.get("current_prompt_index", 0)  # 当前选中的提示词索引
 
@@ -1289,8 +1290,7 @@ class AIAssistantApp(QtWidgets.QMainWindow):
         """更新透明度显示标签"""
         self.opacity_value_label.setText(str(value))
         if self.overlay:
-            self.config_manager.config["background_opacity"] = value
-            self.overlay.update_background_opacity()
+            self.overlay.update_background_opacity(value)
 
     def handle_capture_protection_change(self, state):
         """处理防截屏保护状态变更"""
@@ -1462,6 +1462,12 @@ class AIAssistantApp(QtWidgets.QMainWindow):
 
         self._apply_basic_settings(settings)
 
+        if not self.config_manager.flush():
+            error = self.config_manager.last_save_error
+            self.log_manager.add_log(f"基本设置写入配置文件失败: {error}", "ERROR")
+            QtWidgets.QMessageBox.warning(self, "保存失败", f"配置文件写入失败，修改仅在本次运行中生效\n{error}")
+            return
+
         if show_message:
             provider = settings["provider"]
             self.log_manager.add_log(f"基本设置已保存 (提供商: {provider})")
@@ -1596,14 +1602,17 @@ class AIAssistantApp(QtWidgets.QMainWindow):
         """设置热键"""
         control_hotkeys = self.config_manager.get("hotkeys", {})
 
-        # 绑定提示词发送快捷键 (alt+z 发送当前选中的提示词)
-        send_prompt_key = control_hotkeys.get("send_prompt", "alt+z")
-        send_prompt_handler = lambda: threading.Thread(
-            target=self.send_current_prompt, daemon=True
-        ).start()
+        def in_thread(target):
+            return lambda: threading.Thread(target=target, daemon=True).start()
 
-        if self.hotkey_handler.register_hotkey(send_prompt_key, send_prompt_handler):
-            self.log_manager.add_log(f"绑定提示词发送快捷键: {send_prompt_key}")
+        def safe_scroll(direction):
+            def handler():
+                try:
+                    if self.overlay:
+                        getattr(self.overlay, f"scroll_{direction}")()
+                except Exception as e:
+                    self.log_manager.add_log(f"滚动失败: {e}", "WARNING")
+            return handler
 
         # 绑定每个提示词的快捷键（按快捷键直接发送对应提示词）
         prompts = self.config_manager.get("prompts", [])
@@ -1614,10 +1623,7 @@ class AIAssistantApp(QtWidgets.QMainWindow):
 
             # 创建处理函数，直接发送该提示词
             def make_handler(prompt_index):
-                return lambda: threading.Thread(
-                    target=lambda: self.send_prompt_by_index(prompt_index),
-                    daemon=True
-                ).start()
+                return in_thread(lambda: self.send_prompt_by_index(prompt_index))
 
             handler = make_handler(i)
             prompt_name = prompt.get('name', f'提示词{i+1}')
@@ -1625,60 +1631,26 @@ class AIAssistantApp(QtWidgets.QMainWindow):
             if self.hotkey_handler.register_hotkey(hotkey_str, handler):
                 self.log_manager.add_log(f"绑定提示词: {hotkey_str} -> {prompt_name}")
 
-        # 绑定控制快捷键
-
-        # 浮窗切换 - 使用信号确保线程安全
-        toggle_key = control_hotkeys.get("toggle", "alt+q")
-        toggle_handler = lambda: self.toggle_overlay_signal.emit()
-
-        if self.hotkey_handler.register_hotkey(toggle_key, toggle_handler):
-            self.log_manager.add_log(f"绑定浮窗切换快捷键: {toggle_key}")
-
-        # 纯截图
-        screenshot_key = control_hotkeys.get("screenshot_only", "alt+w")
-        screenshot_handler = lambda: threading.Thread(
-            target=self.capture_screenshot_only, daemon=True
-        ).start()
-        if self.hotkey_handler.register_hotkey(screenshot_key, screenshot_handler):
-            self.log_manager.add_log(f"绑定纯截图快捷键: {screenshot_key}")
-
-        # 清空截图历史
-        clear_key = control_hotkeys.get("clear_screenshots", "alt+v")
-        clear_handler = lambda: threading.Thread(
-            target=self.clear_screenshot_history, daemon=True
-        ).start()
-        if self.hotkey_handler.register_hotkey(clear_key, clear_handler):
-            self.log_manager.add_log(f"绑定清空截图快捷键: {clear_key}")
-
-        # 滚动快捷键
-        scroll_up_key = control_hotkeys.get("scroll_up", "alt+up")
-        scroll_down_key = control_hotkeys.get("scroll_down", "alt+down")
-
-        def safe_scroll_up():
-            try:
-                if self.overlay:
-                    self.overlay.scroll_up()
-            except Exception as e:
-                self.log_manager.add_log(f"滚动失败: {e}", "WARNING")
-
-        def safe_scroll_down():
+        # 绑定控制快捷键: (配置键, 默认值, 处理函数, 描述)
+        control_bindings = [
+            # alt+z 发送当前选中的提示词
+            ("send_prompt", "alt+z", in_thread(self.send_current_prompt), "提示词发送"),
+            # 浮窗切换/切换服务商 - 使用信号确保线程安全
+            ("toggle", "alt+q", lambda: self.toggle_overlay_signal.emit(), "浮窗切换"),
+            ("screenshot_only", "alt+w", in_thread(self.capture_screenshot_only), "纯截图"),
+            ("clear_screenshots", "alt+v", in_thread(self.clear_screenshot_history), "清空截图"),
+            ("scroll_up", "alt+up", safe_scroll("up"), "向上滚动"),
+            ("scroll_down", "alt+down", safe_scroll("down"), "向下滚动"),
+            ("switch_provider", "alt+s", lambda: self.toggle_provider_signal.emit(), "切换服务商"),
+        ]
+
+        for config_key, default_key, handler, description in control_bindings:
+            hotkey_str = control_hotkeys.get(config_key, default_key)
             try:
-                if self.overlay:
-                    self.overlay.scroll_down()
+                if self.hotkey_handler.register_hotkey(hotkey_str, handler):
+                    self.log_manager.add_log(f"绑定{description}快捷键: {hotkey_str}")
             except Exception as e:
-                self.log_manager.add_log(f"滚动失败: {e}", "WARNING")
-
-        if self.hotkey_handler.register_hotkey(scroll_up_key, safe_scroll_up):
-            self.log_manager.add_log(f"绑定向上滚动快捷键: {scroll_up_key}")
-
-        if self.hotkey_handler.register_hotkey(scroll_down_key, safe_scroll_down):
-            self.log_manager.add_log(f"绑定向下滚动快捷键: {scroll_down_key}")
-
-        # 切换服务商快捷键 - 使用信号确保线程安全
-        switch_provider_key = "alt+s"
-        switch_provider_handler = lambda: self.toggle_provider_signal.emit()
-        if self.hotkey_handler.register_hotkey(switch_provider_key, switch_provider_handler):
-            self.log_manager.add_log(f"绑定切换服务商快捷键: {switch_provider_key}")
+                self.log_manager.add_log(f"绑定{description}快捷键失败 {hotkey_str}: {e}", "WARNING")
 
     def stop_listening(self):
         """停止快捷键监听"""
@@ -1699,21 +1671,46 @@ class AIAssistantApp(QtWidgets.QMainWindow):
         try:
             # 使用智能截图选择器
             if SCREENSHOT_MODE.get("use_selector", True):
-                self.pending_prompt = None  # 标记为纯截图
-                # 发送信号到主线程
-                self.trigger_screenshot_signal.emit(False)
+                # 发送信号到主线程（None 表示纯截图）
+                self.trigger_screenshot_signal.emit(None)
                 return
             else:
                 # 传统截图
-                png = capture_screen()
-                self.save_screenshot_to_history(png)
+                png = self._capture_single_flight()
+                if png is not None:
+                    self.save_screenshot_to_history(png)
 
         except Exception as e:
             self.log_manager.add_log(f"截图保存失败: {e}", "ERROR")
 
-    def handle_screenshot_in_main_thread(self, with_prompt: bool):
-        """在主线程中处理截图（避免线程问题）"""
-        if with_prompt:
+    def _capture_single_flight(self):
+        """截图（已有截图进行中时跳过，返回 None），避免连按快捷键叠加全屏缓冲"""
+        if not self._capture_lock.acquire(blocking=False):
+            self.log_manager.add_log("截图正在进行中，跳过")
+            return None
+        try:
+            return capture_screen()
+        finally:
+            self._capture_lock.release()
+
+    def _selector_active(self) -> bool:
+        """截图选择器是否仍在进行中；已关闭、隐藏或被销毁的选择器视为已结束并清除引用"""
+        selector = self.screenshot_selector
+        if selector is None:
+            return False
+        if sip.isdeleted(selector) or not selector.isVisible():
+            self.screenshot_selector = None
+            return False
+        return True
+
+    def handle_screenshot_in_main_thread(self, prompt):
+        """在主线程中处理截图（避免线程问题），prompt 为 None 时仅截图"""
+        if self._selector_active():
+            # 截图选择器已打开，不再重复抓取全屏；也不改动正在进行的截图对应的提示词
+            self.log_manager.add_log("截图正在进行中，跳过")
+            return
+        self.pending_prompt = prompt
+        if prompt is not None:
             self.start_smart_screenshot()
         else:
             self.start_smart_screenshot_only()
@@ -1867,9 +1864,7 @@ class AIAssistantApp(QtWidgets.QMainWindow):
                 self.log_manager.add_log(f"响应预览: {preview}")
 
             # 渲染markdown为HTML并显示
-            from markdown_it import MarkdownIt
-            html = MarkdownIt("commonmark", {"html": True}).render(response)
-            self.overlay.handle_response(html)
+            self.overlay.handle_markdown(response)
             self.log_manager.add_log("API 响应已显示在浮窗")
 
         except Exception as e:
@@ -1886,14 +1881,12 @@ class AIAssistantApp(QtWidgets.QMainWindow):
                 return
 
             # 计算释放的内存
-            total_size_mb = sum(len(img) for img in self.screenshot_history) / (1024 * 1024)
+            total_size_mb = self._history_bytes / (1024 * 1024)
             count = len(self.screenshot_history)
 
-            # 释放内存
-            for img in self.screenshot_history:
-                del img
+            # 释放内存（bytes 无循环引用，清空列表后即由引用计数回收）
             self.screenshot_history.clear()
-            gc.collect()
+            self._history_bytes = 0
 
             self.log_manager.add_log(
                 f"已清空 {count} 张截图，释放约 {total_size_mb:.1f} MB 内存"
@@ -1917,6 +1910,7 @@ class AIAssistantApp(QtWidgets.QMainWindow):
 
         except Exception as e:
             self.log_manager.add_log(f"启动智能截图失败: {e}", "ERROR")
+            self.screenshot_selector = None
             # 回退到传统截图
             if self.pending_prompt:
                 self.process_prompt_with_screenshot(capture_screen(), self.pending_prompt)
@@ -1954,6 +1948,7 @@ class AIAssistantApp(QtWidgets.QMainWindow):
             self.screenshot_selector.start_capture()
         except Exception as e:
             self.log_manager.add_log(f"启动智能截图失败: {e}", "ERROR")
+            self.screenshot_selector = None
             # 回退到传统截图
             self.save_screenshot_to_history(capture_screen())
 
@@ -1974,15 +1969,17 @@ class AIAssistantApp(QtWidgets.QMainWindow):
             # 实施LRU策略，限制历史截图数量
             if len(self.screenshot_history) >= MAX_SCREENSHOT_HISTORY:
                 removed = self.screenshot_history.pop(0)
+                self._history_bytes -= len(removed)
                 del removed
                 self.log_manager.add_log(
                     f"已达到最大截图数量限制({MAX_SCREENSHOT_HISTORY})，移除最旧的截图"
                 )
 
             self.screenshot_history.append(png)
+            self._history_bytes += len(png)
 
             # 计算当前内存占用
-            total_size_mb = sum(len(img) for img in self.screenshot_history) / (1024 * 1024)
+            total_size_mb = self._history_bytes / (1024 * 1024)
             self.log_manager.add_log(
                 f"截图已保存到历史记录 (共 {len(self.screenshot_history)} 张, "
                 f"约 {total_size_mb:.1f} MB)"
@@ -2003,7 +2000,7 @@ class AIAssistantApp(QtWidgets.QMainWindow):
             provider = self.config_manager.get("provider", "Gemini")
             self.log_manager.add_log(f"🤖 使用提供商: {provider}")
 
-            total_size_mb = sum(len(img) for img in all_images) / (1024 * 1024)
+            total_size_mb = (self._history_bytes + len(current_png)) / (1024 * 1024)
             self.log_manager.add_log(
                 f"准备发送 {len(all_images)} 张图片到 {provider} "
                 f"(总大小: {total_size_mb:.1f} MB)"
@@ -2083,14 +2080,12 @@ class AIAssistantApp(QtWidgets.QMainWindow):
                 return
 
             # 计算释放的内存
-            total_size_mb = sum(len(img) for img in self.screenshot_history) / (1024 * 1024)
+            total_size_mb = self._history_bytes / (1024 * 1024)
             count = len(self.screenshot_history)
 
-            # 清空历史截图，释放内存
-            for img in self.screenshot_history:
-                del img
+            # 清空历史截图，释放内存（由引用计数直接回收，无需触发全量 GC）
             self.screenshot_history.clear()
-            gc.collect()
+            self._history_bytes = 0
             self.log_manager.add_log(f"历史截图已清空({count}张, {total_size_mb:.1f}MB)，内存已释放")
 
         except Exception as e:
@@ -2111,20 +2106,17 @@ class AIAssistantApp(QtWidgets.QMainWindow):
             chunk_count = 0
 
             for chunk_text, is_complete in response_stream:
-                chunk_count += 1
-                self.log_manager.add_log(f"收到chunk #{chunk_count}, 完成状态: {is_complete}")
-
                 if is_complete:
                     # 流式响应完成
-                    self.log_manager.add_log(f"流式响应完成，总长度: {len(full_response)}字符")
+                    self.log_manager.add_log(f"流式响应完成，共 {chunk_count} 个内容块，总长度: {len(full_response)}字符")
                     if self.overlay:
                         self.overlay.finish_streaming()
                     self._process_complete_response(full_response)
                     break
                 else:
-                    # 追加内容块
+                    # 追加内容块（逐块日志会在流式过程中频繁写文件和刷新日志界面，只在结束时汇总）
+                    chunk_count += 1
                     full_response += chunk_text
-                    self.log_manager.add_log(f"追加内容: {chunk_text[:50]}...")
                     if self.overlay:
                         self.overlay.content_chunk.emit(chunk_text)
 
@@ -2135,10 +2127,8 @@ class AIAssistantApp(QtWidgets.QMainWindow):
             # 回退到传统渲染
             if full_response and self.overlay:
                 try:
-                    from markdown_it import MarkdownIt
-                    html = MarkdownIt("commonmark", {"html": True}).render(full_response)
-                    self.overlay.handle_response(html)
-                except Exception:
+                    self.overlay.markdown_ready.emit(full_response)
+                except RuntimeError:
                     pass
 
     def _process_complete_response(self, md_content: str):
@@ -2156,13 +2146,14 @@ class AIAssistantApp(QtWidgets.QMainWindow):
 
             # 使用智能截图选择器
             if SCREENSHOT_MODE.get("use_selector", True):
-                self.pending_prompt = prompt
-                # 发送信号到主线程
-                self.trigger_screenshot_signal.emit(True)
+                # 发送信号到主线程，由主线程在确认可以截图后设置 pending_prompt
+                self.trigger_screenshot_signal.emit(prompt)
                 return  # 等待截图完成后继续
             else:
                 # 使用传统截图方式
-                current_png = capture_screen()
+                current_png = self._capture_single_flight()
+                if current_png is None:
+                    return
                 self.log_manager.add_log("当前截屏完成")
                 self.process_prompt_with_screenshot(current_png, prompt)
 
@@ -2188,6 +2179,11 @@ class AIAssistantApp(QtWidgets.QMainWindow):
         if self.overlay:
             self.overlay.close()
         self.tray_icon.hide()
+        if not self.config_manager.flush():
+            error = self.config_manager.last_save_error
+            self.log_manager.add_log(f"退出前保存配置失败: {error}", "ERROR")
+            QtWidgets.QMessageBox.warning(self, "保存失败", f"配置文件写入失败，部分修改将在退出后丢失\n{error}")
+        self.log_manager.close()
         QtWidgets.QApplication.quit()
 
 
@@ -2259,9 +2255,14 @@ def main():
     main_window = AIAssistantApp(config_manager, log_manager, single_instance)
     main_window.show()
 
+    # 界面可交互后再清理过期日志，避免启动时同步扫描日志目录
+    QtCore.QTimer.singleShot(5000, log_manager.cleanup_old_logs)
+
     try:
         sys.exit(app.exec())
     finally:
+        # 写入尚未落盘的配置修改
+        config_manager.flush()
         # 确保释放锁
         single_instance.release_lock()
 